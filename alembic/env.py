@@ -16,7 +16,7 @@ from app.core.config import settings
 config = context.config
 
 # この行を追加して、環境変数からデータベースURLを取得
-config.set_main_option('sqlalchemy.url', settings.DATABASE_URL)
+config.set_main_option('sqlalchemy.url', settings.SQLALCHEMY_DATABASE_URL)
 
 # Alembicの設定ファイルからロガーの設定を読み込む
 if config.config_file_name is not None:
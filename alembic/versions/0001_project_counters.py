@@ -0,0 +1,48 @@
+"""プロジェクトのいいね数・コメント数カウンターといいねテーブルを追加
+
+Revision ID: 0001_project_counters
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001_project_counters"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "co_creation_projects",
+        sa.Column("likes_count", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.add_column(
+        "co_creation_projects",
+        sa.Column("comments_count", sa.Integer(), nullable=False, server_default="0")
+    )
+
+    op.create_table(
+        "user_project_likes",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.user_id"), primary_key=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("co_creation_projects.project_id"), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_user_project_likes_project_id", "user_project_likes", ["project_id"])
+
+    # 既存データからカウンターを初期化
+    op.execute(
+        "UPDATE co_creation_projects p SET comments_count = ("
+        " SELECT COUNT(*) FROM messages m"
+        " JOIN troubles t ON t.trouble_id = m.trouble_id"
+        " WHERE t.project_id = p.project_id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_project_likes_project_id", table_name="user_project_likes")
+    op.drop_table("user_project_likes")
+    op.drop_column("co_creation_projects", "comments_count")
+    op.drop_column("co_creation_projects", "likes_count")
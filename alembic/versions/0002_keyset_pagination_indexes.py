@@ -0,0 +1,37 @@
+"""カーソルページング用の複合インデックスを追加
+
+Revision ID: 0002_keyset_pagination_indexes
+Revises: 0001_project_counters
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002_keyset_pagination_indexes"
+down_revision = "0001_project_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_troubles_created_at_trouble_id",
+        "troubles",
+        ["created_at", "trouble_id"]
+    )
+    op.create_index(
+        "ix_messages_trouble_id_created_at",
+        "messages",
+        ["trouble_id", "created_at"]
+    )
+    op.create_index(
+        "ix_co_creation_projects_creator_created_at",
+        "co_creation_projects",
+        ["creator_user_id", "created_at", "project_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_co_creation_projects_creator_created_at", table_name="co_creation_projects")
+    op.drop_index("ix_messages_trouble_id_created_at", table_name="messages")
+    op.drop_index("ix_troubles_created_at_trouble_id", table_name="troubles")
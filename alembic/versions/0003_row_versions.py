@@ -0,0 +1,35 @@
+"""ETag用の行バージョンと troubles.updated_at を追加
+
+Revision ID: 0003_row_versions
+Revises: 0002_keyset_pagination_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_row_versions"
+down_revision = "0002_keyset_pagination_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "co_creation_projects",
+        sa.Column("row_version", sa.Integer(), nullable=False, server_default="1")
+    )
+    op.add_column(
+        "troubles",
+        sa.Column("row_version", sa.Integer(), nullable=False, server_default="1")
+    )
+    op.add_column(
+        "troubles",
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("troubles", "updated_at")
+    op.drop_column("troubles", "row_version")
+    op.drop_column("co_creation_projects", "row_version")
@@ -0,0 +1,31 @@
+"""お困りごと一覧の絞り込み・並び替え用の複合インデックスを追加
+
+Revision ID: 0004_trouble_listing_indexes
+Revises: 0003_row_versions
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_trouble_listing_indexes"
+down_revision = "0003_row_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_troubles_project_id_status_created_at",
+        "troubles",
+        ["project_id", "status", "created_at"]
+    )
+    op.create_index(
+        "ix_troubles_category_id_created_at",
+        "troubles",
+        ["category_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_troubles_category_id_created_at", table_name="troubles")
+    op.drop_index("ix_troubles_project_id_status_created_at", table_name="troubles")
@@ -0,0 +1,32 @@
+"""お困りごとのコメント数カウンターを追加
+
+Revision ID: 0005_trouble_comment_counts
+Revises: 0004_trouble_listing_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_trouble_comment_counts"
+down_revision = "0004_trouble_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "troubles",
+        sa.Column("comments_count", sa.Integer(), nullable=False, server_default="0")
+    )
+
+    # 既存データからカウンターを初期化（messages(trouble_id, created_at) インデックスで集計）
+    op.execute(
+        "UPDATE troubles t SET comments_count = ("
+        " SELECT COUNT(*) FROM messages m"
+        " WHERE m.trouble_id = t.trouble_id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("troubles", "comments_count")
@@ -0,0 +1,36 @@
+"""プロジェクト・カテゴリー・ステータス別のお困りごと件数テーブルを追加
+
+Revision ID: 0006_trouble_status_summary
+Revises: 0005_trouble_comment_counts
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_trouble_status_summary"
+down_revision = "0005_trouble_comment_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trouble_status_summary",
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("co_creation_projects.project_id"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("trouble_categories.category_id"), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("trouble_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("project_id", "category_id", "status"),
+    )
+
+    # 既存データから件数を初期化（以降は python -m app.services.trouble_stats で再集計できる）
+    op.execute(
+        "INSERT INTO trouble_status_summary (project_id, category_id, status, trouble_count)"
+        " SELECT project_id, category_id, COALESCE(status, '未解決'), COUNT(*) FROM troubles"
+        " GROUP BY project_id, category_id, COALESCE(status, '未解決')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trouble_status_summary")
@@ -0,0 +1,25 @@
+"""users.categories（興味/専門カテゴリー）を追加
+
+Revision ID: 0007_user_categories
+Revises: 0006_trouble_status_summary
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007_user_categories"
+down_revision = "0006_trouble_status_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("categories", sa.Text(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "categories")
@@ -0,0 +1,28 @@
+"""messages.ack_id（受付キューの受付ID）を追加
+
+Revision ID: 0008_message_ack_ids
+Revises: 0007_user_categories
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008_message_ack_ids"
+down_revision = "0007_user_categories"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "messages",
+        sa.Column("ack_id", sa.String(32), nullable=True)
+    )
+    # 同期の投稿は NULL のため、一意制約は受付キュー経由の行のみに効く
+    op.create_unique_constraint("uq_messages_ack_id", "messages", ["ack_id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_messages_ack_id", "messages", type_="unique")
+    op.drop_column("messages", "ack_id")
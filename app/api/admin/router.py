@@ -0,0 +1,65 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.core.database import async_engine, async_pool_metrics, engine, pool_metrics
+from app.core.dependencies import get_admin_user_snapshot
+from app.core.token_cache import UserSnapshot, token_cache
+from app.services.cache import result_cache
+from app.services.message_ingest import message_ingestor
+from app.services.login_throttle import login_throttle
+
+# 統計には試行制限中のユーザー名・IPなどが含まれるため、管理者（設定 ADMIN_USER_IDS）のみに公開する
+router = APIRouter()
+
+@router.get("/cache/stats")
+def get_cache_stats(
+    current_user: UserSnapshot = Depends(get_admin_user_snapshot)
+) -> Dict[str, Any]:
+    """
+    結果キャッシュの名前空間ごとのヒット率を取得する（TTL調整用）
+    """
+    return result_cache.stats()
+
+
+@router.get("/messages/ingest/stats")
+def get_message_ingest_stats(
+    current_user: UserSnapshot = Depends(get_admin_user_snapshot)
+) -> Dict[str, int]:
+    """
+    メッセージ受付キューの受付・保存・拒否件数と滞留数を取得する
+    """
+    return message_ingestor.stats()
+
+
+@router.get("/auth/token-cache/stats")
+def get_token_cache_stats(
+    current_user: UserSnapshot = Depends(get_admin_user_snapshot)
+) -> Dict[str, Any]:
+    """
+    認証済みトークンのキャッシュのヒット率・保持件数を取得する
+    """
+    return token_cache.stats()
+
+
+@router.get("/auth/login-throttle/stats")
+def get_login_throttle_stats(
+    current_user: UserSnapshot = Depends(get_admin_user_snapshot)
+) -> Dict[str, Any]:
+    """
+    ログイン試行制限の許可・拒否件数と保持中のキー数を取得する
+    """
+    return login_throttle.stats()
+
+
+@router.get("/db/pool/stats")
+def get_db_pool_stats(
+    current_user: UserSnapshot = Depends(get_admin_user_snapshot)
+) -> Dict[str, Any]:
+    """
+    このワーカーの接続プール（同期・非同期）の使用状況・接続待ち時間・接続の経過時間を取得する（プールサイズ調整用）
+    """
+    return {
+        "sync": pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+    }
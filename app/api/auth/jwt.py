@@ -5,7 +5,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from app.core.security import verify_password, SECRET_KEY, ALGORITHM
+from starlette.concurrency import run_in_threadpool
+from app.core.security import verify_password, verify_and_update_password_async, SECRET_KEY, ALGORITHM
 from app.core.config import settings
 
 from app.core.database import get_db
@@ -29,6 +30,33 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
         return None
     return user
 
+async def authenticate_user_async(db: Session, username: str, password: str) -> Optional[User]:
+    """
+    ユーザー名とパスワードでユーザーを認証する（ログインエンドポイント用）
+    パスワードの検証はハッシュ計算専用のスレッドプールで行い、イベントループとリクエスト用のスレッドを塞がない
+    保存済みのハッシュのコストが設定と異なる場合は、新しいコストで再ハッシュして保存する
+    
+    :param db: データベースセッション
+    :param username: ユーザー名
+    :param password: パスワード
+    :return: 認証されたユーザー、または認証失敗の場合はNone
+    """
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.name == username).first())
+    if not user:
+        return None
+    
+    valid, new_hash = await verify_and_update_password_async(password, user.password)
+    if not valid:
+        return None
+    
+    if new_hash:
+        def save_new_hash():
+            user.password = new_hash
+            db.commit()
+            db.refresh(user)
+        await run_in_threadpool(save_new_hash)
+    return user
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     アクセストークンを生成する
@@ -1,29 +1,52 @@
-from datetime import timedelta
-from typing import Any
+import math
+from datetime import datetime, timedelta
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.core.database import get_db
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.core.config import settings
 
-from app.api.auth.jwt import authenticate_user, create_access_token
+from app.api.auth.jwt import authenticate_user_async, create_access_token
 from app.api.users.models import User
 from app.api.users.schemas import UserCreate, UserResponse, Token
+from app.services.leaderboard import leaderboard
+from app.services.helper_matcher import helper_matcher
+from app.services.login_throttle import login_throttle
 
 router = APIRouter()
 
+async def enforce_login_throttle(request: Request, username: str) -> None:
+    """
+    ユーザー名・接続元IPごとのログイン試行制限を確認し、上限を超えていれば429を返す
+    DB検索やパスワード検証より前に呼び出す
+    """
+    client_ip: Optional[str] = request.client.host if request.client else None
+    retry_after = await login_throttle.check(username, client_ip)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="ログインの試行回数が多すぎます。しばらくしてから再度お試しください",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(), 
     db: Session = Depends(get_db)
 ) -> Any:
     """
     OAuth2互換のトークンログインエンドポイント
     """
+    # 試行回数の上限を超えていれば、認証処理の前に弾く
+    await enforce_login_throttle(request, form_data.username)
+    
     # ユーザーを認証
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     
     if not user:
         raise HTTPException(
@@ -35,7 +58,7 @@ def login_for_access_token(
     # アクセストークンを生成
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.user_id}, 
+        data={"sub": str(user.user_id)},  # JWTの sub は文字列である必要がある
         expires_delta=access_token_expires
     )
     
@@ -47,7 +70,8 @@ def login_for_access_token(
     }
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
+    request: Request,
     username: str,
     password: str,
     db: Session = Depends(get_db)
@@ -55,8 +79,11 @@ def login(
     """
     ユーザー名とパスワードでログイン
     """
+    # 試行回数の上限を超えていれば、認証処理の前に弾く
+    await enforce_login_throttle(request, username)
+    
     # ユーザーを認証
-    user = authenticate_user(db, username, password)
+    user = await authenticate_user_async(db, username, password)
     
     if not user:
         raise HTTPException(
@@ -67,7 +94,7 @@ def login(
     # アクセストークンを生成
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.user_id}, 
+        data={"sub": str(user.user_id)},
         expires_delta=access_token_expires
     )
     
@@ -79,12 +106,13 @@ def login(
     }
 
 @router.post("/register", response_model=Token)
-def register_user(
+async def register_user(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ) -> Any:
     """
     新規ユーザー登録
+    パスワードのハッシュ化はハッシュ計算専用のスレッドプールで行う
     """
     # パスワード確認
     if user_data.password != user_data.confirm_password:
@@ -94,7 +122,7 @@ def register_user(
         )
     
     # ユーザー名の重複チェック
-    existing_user = db.query(User).filter(User.name == user_data.name).first()
+    existing_user = await run_in_threadpool(lambda: db.query(User).filter(User.name == user_data.name).first())
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -104,7 +132,8 @@ def register_user(
     # 新しいユーザーを作成
     user = User(
         name=user_data.name,
-        hashed_password=get_password_hash(user_data.password),
+        password=await get_password_hash_async(user_data.password),  # hashed_passwordをpasswordに変更
+        last_login_at=datetime.now(),
     )
     
     # カテゴリーがあれば設定
@@ -112,14 +141,20 @@ def register_user(
         user.set_categories_list(user_data.categories)
     
     # データベースに保存
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    def save_user():
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    await run_in_threadpool(save_user)
+    
+    # ランキングに新規ユーザーを追加
+    leaderboard.update(user.user_id, user.name, user.point_total)
+    helper_matcher.update_user(user.user_id, user.name, user.point_total, user.categories)
     
     # アクセストークンを生成
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.user_id}, 
+        data={"sub": str(user.user_id)},
         expires_delta=access_token_expires
     )
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -6,12 +6,19 @@ from app.core.database import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # スレッド内のカーソルページング用（主キーidはInnoDBのセカンダリインデックスに含まれる）
+        Index("ix_messages_trouble_id_created_at", "trouble_id", "created_at"),
+        UniqueConstraint("ack_id", name="uq_messages_ack_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
     trouble_id = Column(Integer, ForeignKey("troubles.trouble_id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 受付キュー経由で保存したメッセージの受付ID（保存後に採番されたIDを読み戻すため）
+    ack_id = Column(String(32), nullable=True)
     
     # リレーションシップ
     user = relationship("User", back_populates="messages")
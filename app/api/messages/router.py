@@ -1,12 +1,20 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 # 相対インポートに修正
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.api.users.models import User
+from app.core.database import SessionLocal, get_db
+from app.core.dependencies import get_current_user_snapshot, websocket_user_id
+from app.core.token_cache import UserSnapshot
+from app.core.pagination import encode_cursor, keyset_filter, next_cursor_for
 from app.api.troubles.models import Trouble
+from app.services.project_counters import increment_project_counters, increment_trouble_comments
+from app.services.list_counts import count_messages, invalidate_message_counts
+from app.services.pubsub import hub, trouble_channel
+from app.services.messages import message_created_event, message_thread_query, to_message_response
+from app.services.message_ingest import IngestQueueFull, message_ingestor
 from .models import Message
 from . import schemas
 
@@ -15,14 +23,14 @@ router = APIRouter()
 @router.post("/", response_model=schemas.MessageResponse)
 def create_message(
     message: schemas.MessageCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
     db: Session = Depends(get_db)
 ):
     """
     新しいメッセージを作成する
     """
     # お困りごとの存在確認
-    trouble = db.query(Trouble).filter(Trouble.id == message.trouble_id).first()
+    trouble = db.query(Trouble).filter(Trouble.trouble_id == message.trouble_id).first()
     if not trouble:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -37,10 +45,14 @@ def create_message(
     )
     
     db.add(new_message)
+    # プロジェクト・お困りごとのコメント数を同一トランザクションで加算
+    increment_project_counters(db, trouble.project_id, comments=1)
+    increment_trouble_comments(db, trouble.trouble_id)
     db.commit()
     db.refresh(new_message)
+    invalidate_message_counts(new_message.trouble_id)
     
-    return schemas.MessageResponse(
+    response = schemas.MessageResponse(
         id=new_message.id,
         content=new_message.content,
         user_id=new_message.user_id,
@@ -48,45 +60,156 @@ def create_message(
         trouble_id=new_message.trouble_id,
         created_at=new_message.created_at
     )
+    # スレッドを購読中のクライアントへ新着を配信
+    hub.publish_threadsafe(trouble_channel(new_message.trouble_id), message_created_event(response))
+    
+    return response
+
+@router.post("/ingest", response_model=schemas.MessageIngestAck, status_code=status.HTTP_202_ACCEPTED)
+def ingest_message(
+    message: schemas.MessageCreate,
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
+    db: Session = Depends(get_db)
+):
+    """
+    メッセージを受付キューに積み、保存を待たずに受付IDを返す（書き込みが集中する場面向け）
+    保存後、スレッドの購読者に受付IDを付けた message.created イベントが配信される
+    保存できなかった場合は同じ受付IDを付けた message.failed イベントが配信される
+    """
+    # お困りごとの存在確認（カウンター更新用にプロジェクトIDも取得）
+    trouble = db.query(Trouble.project_id).filter(Trouble.trouble_id == message.trouble_id).first()
+    if not trouble:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="指定されたお困りごとが見つかりません"
+        )
+    
+    try:
+        ack_id = message_ingestor.submit(
+            trouble_id=message.trouble_id,
+            project_id=trouble.project_id,
+            user_id=current_user.user_id,
+            user_name=current_user.name,
+            content=message.content
+        )
+    except IngestQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="メッセージの受付が混み合っています。しばらくしてから再度お試しください",
+            headers={"Retry-After": "1"}
+        )
+    
+    return schemas.MessageIngestAck(ack_id=ack_id)
+
+def _trouble_exists(trouble_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(Trouble.trouble_id).filter(Trouble.trouble_id == trouble_id).first() is not None
+    finally:
+        db.close()
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # クライアントからの送信（ping等）は読み捨て、切断まで待つ
+    while True:
+        event = await websocket.receive()
+        if event["type"] == "websocket.disconnect":
+            return
+
+@router.websocket("/trouble/{trouble_id}/ws")
+async def subscribe_trouble_messages(
+    websocket: WebSocket,
+    trouble_id: int,
+    token: Optional[str] = None
+):
+    """
+    お困りごとのスレッドを購読し、新着メッセージをプッシュで受け取る
+    接続直後の取りこぼしは GET /trouble/{trouble_id} の cursor で補完する
+    """
+    if websocket_user_id(token) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="認証情報が無効です")
+        return
+    if not await run_in_threadpool(_trouble_exists, trouble_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="指定されたお困りごとが見つかりません")
+        return
+    
+    await websocket.accept()
+    async with hub.subscribe(trouble_channel(trouble_id)) as queue:
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        try:
+            while True:
+                next_event = asyncio.create_task(queue.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected},
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected in done:
+                    next_event.cancel()
+                    break
+                await websocket.send_json(next_event.result())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            disconnected.cancel()
 
 @router.get("/trouble/{trouble_id}", response_model=schemas.MessagesListResponse)
 def get_messages_by_trouble(
     trouble_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="前ページの next_cursor（指定時は skip を無視してカーソル位置から取得）"),
+    include_total: bool = Query(True, description="総数を取得するか（無限スクロールでは false で COUNT を省略）"),
+    approximate_total: bool = Query(False, description="キャッシュ済みの概算の総数を許容するか"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
 ):
     """
     特定のお困りごとに関するメッセージの一覧を取得する
+    新着の確認は前回の latest_cursor を cursor に指定し、それ以降のメッセージのみを取得する
+    """
+    return _messages_page(db, trouble_id, skip, limit, cursor, include_total, approximate_total)
+
+def _messages_page(
+    db: Session,
+    trouble_id: int,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    include_total: bool,
+    approximate_total: bool
+) -> schemas.MessagesListResponse:
+    """
+    メッセージ一覧の1ページを取得する
     """
     # お困りごとの存在確認
-    trouble = db.query(Trouble).filter(Trouble.id == trouble_id).first()
-    if not trouble:
+    trouble_exists = db.query(Trouble.trouble_id).filter(Trouble.trouble_id == trouble_id).first()
+    if not trouble_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定されたお困りごとが見つかりません"
         )
     
-    # メッセージの取得
-    query = db.query(Message).filter(Message.trouble_id == trouble_id)
-    total = query.count()
-    messages = query.order_by(Message.created_at).offset(skip).limit(limit).all()
+    # 総数取得（要求された場合のみ、お困りごとごとにキャッシュ）
+    total, total_is_approximate = None, False
+    if include_total:
+        total, total_is_approximate = count_messages(db, trouble_id, approximate=approximate_total)
     
-    # レスポンスの作成
-    message_responses = []
-    for msg in messages:
-        user = db.query(User).filter(User.user_id == msg.user_id).first()
-        message_responses.append(schemas.MessageResponse(
-            id=msg.id,
-            content=msg.content,
-            user_id=msg.user_id,
-            user_name=user.name if user else "Unknown",
-            trouble_id=msg.trouble_id,
-            created_at=msg.created_at
-        ))
+    # メッセージと投稿者名を1回のクエリで取得（カーソル指定時はその位置より後のメッセージのみ）
+    query = message_thread_query(db, trouble_id)
+    if cursor:
+        query = query.filter(keyset_filter(Message.created_at, Message.id, cursor, descending=False))
+    else:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+    next_cursor = next_cursor_for(rows, limit, "created_at", "id")
+    rows = rows[:limit]
+    
+    # 新着の確認用カーソル（新着がなければ指定されたカーソルをそのまま返す）
+    latest_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if rows else cursor
     
     return schemas.MessagesListResponse(
-        messages=message_responses,
-        total=total
-    )
\ No newline at end of file
+        messages=[to_message_response(row) for row in rows],
+        total=total,
+        total_is_approximate=total_is_approximate,
+        next_cursor=next_cursor,
+        latest_cursor=latest_cursor
+    )
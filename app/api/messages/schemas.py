@@ -17,6 +17,13 @@ class MessageResponse(MessageBase):
     trouble_id: int
     created_at: datetime
 
+class MessageIngestAck(BaseSchemaModel):
+    ack_id: str  # 保存後に配信される message.created（失敗時は message.failed）イベントの ack_id と対応する
+    status: str = "queued"
+
 class MessagesListResponse(BaseSchemaModel):
     messages: List[MessageResponse]
-    total: int
\ No newline at end of file
+    total: Optional[int] = None  # include_total=false の場合は省略
+    total_is_approximate: bool = False  # approximate_total=true で概算値を返した場合はTrue
+    next_cursor: Optional[str] = None  # 次ページ取得用のカーソル（続きがない場合はNone）
+    latest_cursor: Optional[str] = None  # 返却した最後のメッセージのカーソル（cursor に指定すると以降の新着のみ取得できる）
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -18,6 +18,10 @@ class ProjectCategory(Base):
 
 class CoCreationProject(Base):
     __tablename__ = "co_creation_projects"
+    __table_args__ = (
+        # ユーザー別プロジェクト一覧のカーソルページング用
+        Index("ix_co_creation_projects_creator_created_at", "creator_user_id", "created_at", "project_id"),
+    )
 
     project_id = Column(Integer, primary_key=True, index=True)
     creator_user_id = Column(Integer, ForeignKey("users.user_id"), nullable=True)
@@ -27,14 +31,22 @@ class CoCreationProject(Base):
     description = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime, nullable=True)
+    # 一覧表示用の非正規化カウンター（いいね・メッセージ書き込み時に同一トランザクションで更新）
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # 行バージョン（ORMでの更新ごとに加算され、ETagの生成に使用）
+    row_version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # リレーションシップ
     creator = relationship(User, back_populates="projects")
     category = relationship("ProjectCategory", back_populates="projects")  # 追加: カテゴリーとのリレーションシップ
     troubles = relationship("Trouble", back_populates="project")
     favorites = relationship("UserProjectFavorite", back_populates="project")
+    likes = relationship("UserProjectLike", back_populates="project")
     participants = relationship("UserProjectParticipation", back_populates="project")
 
+    __mapper_args__ = {"version_id_col": row_version}
+
 class UserProjectFavorite(Base):
     __tablename__ = "user_project_favorites"
 
@@ -45,6 +57,17 @@ class UserProjectFavorite(Base):
     user = relationship(User, back_populates="favorite_projects")
     project = relationship("CoCreationProject", back_populates="favorites")
 
+class UserProjectLike(Base):
+    __tablename__ = "user_project_likes"
+
+    user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
+    project_id = Column(Integer, ForeignKey("co_creation_projects.project_id"), primary_key=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # リレーションシップ
+    user = relationship(User, back_populates="liked_projects")
+    project = relationship("CoCreationProject", back_populates="likes")
+
 class UserProjectParticipation(Base):
     __tablename__ = "user_project_participation"
 
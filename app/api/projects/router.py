@@ -1,21 +1,54 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import func, desc
 from typing import List, Optional
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.api.users.models import User
-from app.api.projects.models import CoCreationProject, UserProjectFavorite, ProjectCategory
+from app.core.dependencies import get_current_user_snapshot
+from app.core.token_cache import UserSnapshot
+from app.core.pagination import keyset_filter, next_cursor_for
+from app.core.etag import etag_matches, not_modified_response
+from app.api.projects.models import CoCreationProject, UserProjectFavorite, UserProjectLike, ProjectCategory
+from app.services.project_counters import increment_project_counters
+from app.services.leaderboard import leaderboard
+from app.services.search_index import project_search_index
+from app.services.project_import import import_projects, parse_ndjson_line
+from app.services.project_export import iter_project_csv, iter_project_ndjson
+from app.services.favorites import favorite_store
+from app.services.cache import result_cache
+from app.services.category_catalog import project_category_catalog
+from app.services.trouble_stats import (
+    STATUS_OPEN,
+    STATUS_RESOLVED,
+    project_trouble_breakdown,
+    project_trouble_counts
+)
+from app.services.projects import (
+    PROJECT_FEED_NEW_KEY,
+    PROJECT_FEED_TOTAL_KEY,
+    project_feed_favorites_key,
+    invalidate_project_feed,
+    project_response_options,
+    load_favorite_project_ids,
+    to_project_response,
+    to_project_responses,
+    project_detail_state
+)
 from app.api.projects.schemas import (
     ProjectResponse, 
     ProjectListResponse, 
     ProjectCreate, 
     ProjectUpdate,
     CategoryResponse,
-    RankingUser
+    RankingUser,
+    ProjectBulkCreateResponse,
+    ProjectTroubleStatsResponse,
+    TroubleStatusCount
 )
 
 router = APIRouter()
@@ -23,147 +56,113 @@ router = APIRouter()
 # ここから新しく追加するコード
 @router.get("/user", response_model=List[ProjectResponse])
 def get_user_projects(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="取得件数（省略時は全件）"),
+    cursor: Optional[str] = Query(None, description="前ページの X-Next-Cursor ヘッダーの値"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
 ):
-    """現在のユーザーが作成したプロジェクトのみを取得する"""
+    """
+    現在のユーザーが作成したプロジェクトのみを取得する
+    limit 指定時は続きがあれば X-Next-Cursor ヘッダーに次ページのカーソルを返す
+    """
     user_id = current_user.user_id
     
-    # ユーザーが作成したプロジェクトを取得
-    user_projects = (
+    # ユーザーが作成したプロジェクトを取得（作成者・カテゴリーはJOINで一括取得）
+    query = (
         db.query(CoCreationProject)
+        .options(*project_response_options())
         .filter(CoCreationProject.creator_user_id == user_id)
-        .order_by(CoCreationProject.created_at.desc())
-        .all()
+        .order_by(CoCreationProject.created_at.desc(), CoCreationProject.project_id.desc())
     )
+    if cursor:
+        query = query.filter(keyset_filter(CoCreationProject.created_at, CoCreationProject.project_id, cursor))
+    
+    if limit is None:
+        user_projects = query.all()
+    else:
+        user_projects = query.limit(limit + 1).all()
+        next_cursor = next_cursor_for(user_projects, limit, "created_at", "project_id")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        user_projects = user_projects[:limit]
 
     # プロジェクトをレスポンススキーマに変換
-    result = []
-    for project in user_projects:
-        # お気に入り判定
-        is_favorite = db.query(UserProjectFavorite).filter(
-            UserProjectFavorite.user_id == user_id,
-            UserProjectFavorite.project_id == project.project_id
-        ).first() is not None
-
-        # プロジェクト作成者の情報取得
-        creator = db.query(User).filter(User.user_id == project.creator_user_id).first()
-
-        # カテゴリー情報の取得
-        category = None
-        if hasattr(project, 'category_id') and project.category_id:
-            category = db.query(ProjectCategory).filter(
-                ProjectCategory.category_id == project.category_id
-            ).first()
-
-        # ダミーのいいね数とコメント数
-        likes = 24  # TODO: 実際のロジックに置き換える
-        comments = 8  # TODO: 実際のロジックに置き換える
-
-        result.append(ProjectResponse(
-            project_id=project.project_id,
-            title=project.title,
-            summary=project.summary if hasattr(project, 'summary') else None,
-            description=project.description,
-            creator_user_id=project.creator_user_id,
-            creator_name=creator.name if creator else "不明",
-            created_at=project.created_at,
-            updated_at=project.updated_at if hasattr(project, 'updated_at') else None,
-            likes=likes,
-            comments=comments,
-            is_favorite=is_favorite,
-            category_id=project.category_id if hasattr(project, 'category_id') else None,
-            category=CategoryResponse(
-                category_id=category.category_id,
-                name=category.name
-            ) if category else None
-        ))
-    
-    return result
+    return to_project_responses(db, user_projects, user_id)
 # ここまでが新しく追加するコード
 
 @router.get("/", response_model=ProjectListResponse)
 def get_projects(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
 ):
     user_id = current_user.user_id
     
-    # 新着プロジェクト
-    new_projects = (
-        db.query(CoCreationProject)
-        .order_by(CoCreationProject.created_at.desc())
-        .limit(8)
-        .all()
-    )
-
-    # お気に入りプロジェクト
-    favorite_projects = (
-        db.query(CoCreationProject)
-        .join(UserProjectFavorite)
-        .filter(UserProjectFavorite.user_id == user_id)
-        .order_by(CoCreationProject.created_at.desc())
-        .limit(8)
-        .all()
-    )
-
-    # プロジェクト総数
-    total_projects = db.query(CoCreationProject).count()
+    ttl = settings.PROJECT_FEED_CACHE_TTL_SECONDS
+    categories = project_category_catalog.snapshot(db)
+    
+    # 新着プロジェクト（全ユーザー共通部分としてキャッシュ、作成者・カテゴリーはJOINで一括取得）
+    def load_new_projects():
+        projects = (
+            db.query(CoCreationProject)
+            .options(*project_response_options())
+            .order_by(CoCreationProject.created_at.desc())
+            .limit(8)
+            .all()
+        )
+        trouble_counts = project_trouble_counts(db, (p.project_id for p in projects))
+        return [
+            to_project_response(p, categories, False, trouble_counts.get(p.project_id))
+            for p in projects
+        ]
 
-    # プロジェクトをレスポンススキーマに変換
-    def convert_project(project):
-        # ダミーのいいね数とコメント数
-        likes = 24  # TODO: 実際のロジックに置き換える
-        comments = 8  # TODO: 実際のロジックに置き換える
-        
-        # お気に入り判定
-        is_favorite = db.query(UserProjectFavorite).filter(
-            UserProjectFavorite.user_id == user_id,
-            UserProjectFavorite.project_id == project.project_id
-        ).first() is not None
+    # お気に入りプロジェクト（ユーザーごとにキャッシュ）
+    def load_favorite_projects():
+        projects = (
+            db.query(CoCreationProject)
+            .options(*project_response_options())
+            .join(UserProjectFavorite)
+            .filter(UserProjectFavorite.user_id == user_id)
+            .order_by(CoCreationProject.created_at.desc())
+            .limit(8)
+            .all()
+        )
+        trouble_counts = project_trouble_counts(db, (p.project_id for p in projects))
+        return [
+            to_project_response(p, categories, True, trouble_counts.get(p.project_id))
+            for p in projects
+        ]
 
-        # プロジェクト作成者の情報取得
-        creator = db.query(User).filter(User.user_id == project.creator_user_id).first()
+    new_projects = result_cache.get_or_set(PROJECT_FEED_NEW_KEY, load_new_projects, ttl)
+    favorite_projects = result_cache.get_or_set(project_feed_favorites_key(user_id), load_favorite_projects, ttl)
 
-        # カテゴリー情報の取得 (追加)
-        category = None
-        if hasattr(project, 'category_id') and project.category_id:
-            category = db.query(ProjectCategory).filter(
-                ProjectCategory.category_id == project.category_id
-            ).first()
+    # プロジェクト総数（全ユーザー共通部分としてキャッシュ）
+    total_projects = result_cache.get_or_set(
+        PROJECT_FEED_TOTAL_KEY, lambda: db.query(CoCreationProject).count(), ttl
+    )
 
-        return ProjectResponse(
-            project_id=project.project_id,
-            title=project.title,
-            summary=project.summary if hasattr(project, 'summary') else None,
-            description=project.description,
-            creator_user_id=project.creator_user_id,
-            creator_name=creator.name if creator else "不明",
-            created_at=project.created_at,
-            updated_at=project.updated_at if hasattr(project, 'updated_at') else None,
-            likes=likes,
-            comments=comments,
-            is_favorite=is_favorite,
-            category_id=project.category_id if hasattr(project, 'category_id') else None,  # 追加
-            category=CategoryResponse(
-                category_id=category.category_id,
-                name=category.name
-            ) if category else None  # 追加
-        )
+    # お気に入り判定は新着分のみ（お気に入り一覧は定義上すべてお気に入り）
+    favorite_ids = {p.project_id for p in favorite_projects}
+    favorite_ids |= load_favorite_project_ids(
+        db, user_id, (p.project_id for p in new_projects if p.project_id not in favorite_ids)
+    )
 
     return ProjectListResponse(
-        new_projects=[convert_project(p) for p in new_projects],
-        favorite_projects=[convert_project(p) for p in favorite_projects],
+        new_projects=[
+            p.model_copy(update={"is_favorite": True}) if p.project_id in favorite_ids else p
+            for p in new_projects
+        ],
+        favorite_projects=favorite_projects,
         total_projects=total_projects
     )
 
 @router.get("/categories", response_model=List[CategoryResponse])
-def get_project_categories(db: Session = Depends(get_db)):
-    # データベースからカテゴリを取得
-    categories = db.query(ProjectCategory).all()
+def get_project_categories(request: Request, response: Response, db: Session = Depends(get_db)):
+    # カタログ（メモリ）からカテゴリを取得
+    snapshot = project_category_catalog.snapshot(db)
     
     # カテゴリがない場合は初期データを挿入
-    if not categories:
+    if not snapshot.items:
         default_categories = [
             "テクノロジー", "デザイン", "マーケティング", "ビジネス", 
             "教育", "コミュニティ", "医療", "環境"
@@ -174,31 +173,72 @@ def get_project_categories(db: Session = Depends(get_db)):
             db.add(category)
         
         db.commit()
-        categories = db.query(ProjectCategory).all()
+        project_category_catalog.invalidate()
+        snapshot = project_category_catalog.snapshot(db)
     
+    if etag_matches(request, snapshot.etag):
+        return not_modified_response(snapshot.etag)
+    
+    response.headers["ETag"] = snapshot.etag
     return [
         CategoryResponse(
-            category_id=category.category_id,
-            name=category.name
-        ) for category in categories
+            category_id=category_id,
+            name=name
+        ) for category_id, name in snapshot.items
     ]
 
 @router.get("/ranking", response_model=List[RankingUser])
-def get_activity_ranking(db: Session = Depends(get_db)):
-    # TODO: 実際のポイント計算ロジックに置き換える
-    # 現時点では、ダミーデータを返す
-    ranking_data = [
-        RankingUser(name="キツネ", points=1250, rank=1),
-        RankingUser(name="パンダ", points=980, rank=2),
-        RankingUser(name="ウサギ", points=875, rank=3)
-    ]
-    return ranking_data
+def get_activity_ranking(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """ポイント上位のユーザーを取得する（メモリ上のランキングから返す）"""
+    leaderboard.ensure_loaded(db)
+    return leaderboard.top(limit)
+
+@router.get("/ranking/me", response_model=RankingUser)
+def get_my_ranking(
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """現在のユーザーの順位を取得する"""
+    leaderboard.ensure_loaded(db)
+    ranking = leaderboard.rank_of(current_user.user_id)
+    if ranking is None:
+        raise HTTPException(status_code=404, detail="ランキングにユーザーが見つかりません")
+    return ranking
+
+@router.get("/search", response_model=List[ProjectResponse])
+def search_projects(
+    q: str = Query(..., min_length=1, max_length=200, description="検索キーワード"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """タイトル・概要・説明文からプロジェクトを全文検索する（関連度順）"""
+    project_search_index.ensure_loaded(db)
+    hits = project_search_index.search(q, limit)
+    if not hits:
+        return []
+    
+    # ヒットしたプロジェクトを1クエリで取得し、スコア順に並べ直す
+    project_ids = [project_id for project_id, _ in hits]
+    projects = (
+        db.query(CoCreationProject)
+        .options(*project_response_options())
+        .filter(CoCreationProject.project_id.in_(project_ids))
+        .all()
+    )
+    projects_by_id = {project.project_id: project for project in projects}
+    ordered = [projects_by_id[project_id] for project_id in project_ids if project_id in projects_by_id]
+    
+    return to_project_responses(db, ordered, current_user.user_id)
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 def create_project(
     project: ProjectCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
 ):
     # プロジェクト作成のバリデーション
     if not project.title or not project.description:
@@ -213,10 +253,7 @@ def create_project(
 
     # カテゴリーが指定されている場合は存在確認 (追加)
     if hasattr(project, 'category_id') and project.category_id:
-        category = db.query(ProjectCategory).filter(
-            ProjectCategory.category_id == project.category_id
-        ).first()
-        if not category:
+        if not project_category_catalog.contains(db, project.category_id):
             raise HTTPException(
                 status_code=404,
                 detail="指定されたカテゴリーが見つかりません"
@@ -235,63 +272,162 @@ def create_project(
     db.add(new_project)
     db.commit()
     db.refresh(new_project)
+    
+    # 新着・総数が変わるためフィードのキャッシュを無効化
+    invalidate_project_feed()
+    project_search_index.index_project(new_project)
 
     return {
         "message": "プロジェクトを登録しました", 
         "project_id": new_project.project_id
     }
 
+@router.post("/bulk", response_model=ProjectBulkCreateResponse)
+async def bulk_create_projects(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """
+    プロジェクトを一括登録する
+    本文は ProjectCreate のJSON配列、または Content-Type: application/x-ndjson の1行1件形式
+    """
+    max_items = settings.PROJECT_BULK_MAX_ITEMS
+    content_type = request.headers.get("content-type", "")
+    
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        # NDJSONは受信しながら1行ずつ読み込む
+        items = []
+        # 改行の来ていない行の残り（受信したチャンクのみを分割し、全体の連結・再分割を繰り返さない）
+        pending = bytearray()
+        async for chunk in request.stream():
+            if b"\n" not in chunk:
+                pending += chunk
+                continue
+            first, *lines, last = chunk.split(b"\n")
+            pending += first
+            lines.insert(0, bytes(pending))
+            pending = bytearray(last)
+            items.extend(parse_ndjson_line(line) for line in lines if line.strip())
+            if len(items) > max_items:
+                break
+        if pending.strip():
+            items.append(parse_ndjson_line(bytes(pending)))
+    else:
+        try:
+            items = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="JSONの形式が不正です")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="プロジェクトの配列を指定してください")
+    
+    if len(items) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"一度に登録できるのは{max_items}件までです"
+        )
+    
+    # DBアクセスはイベントループを塞がないようスレッドプールで実行
+    results = await run_in_threadpool(import_projects, db, items, current_user.user_id)
+    created = sum(1 for result in results if result.status == "created")
+    
+    return ProjectBulkCreateResponse(
+        created=created,
+        failed=len(results) - created,
+        results=results
+    )
+
 @router.get("/{project_id}", response_model=ProjectResponse)
 def get_project(
     project_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[UserSnapshot] = Depends(get_current_user_snapshot)
 ):
-    # プロジェクトの詳細を取得
-    project = db.query(CoCreationProject).filter(CoCreationProject.project_id == project_id).first()
+    user_id = current_user.user_id if current_user else None
     
-    if not project:
+    # 変更がなければ詳細の取得・変換を行わずに304を返す
+    state = project_detail_state(db, project_id, user_id)
+    if state is None:
         raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    if etag_matches(request, state.etag):
+        return not_modified_response(state.etag)
     
-    # TODO: いいね数とコメント数の実装
-    likes = 24  # 仮の値
-    comments = 8  # 仮の値
+    # プロジェクトの詳細を取得（作成者はJOINで一括取得）
+    project = (
+        db.query(CoCreationProject)
+        .options(*project_response_options())
+        .filter(CoCreationProject.project_id == project_id)
+        .first()
+    )
     
-    # お気に入り判定
-    is_favorite = False
-    if current_user:
-        is_favorite = db.query(UserProjectFavorite).filter(
-            UserProjectFavorite.user_id == current_user.user_id,
-            UserProjectFavorite.project_id == project_id
-        ).first() is not None
+    if not project:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    
+    # お気に入り判定・お困りごと数はETagの計算時に取得した値を使う
+    response.headers["ETag"] = state.etag
+    return state.to_response(project)
+
+@router.get("/{project_id}/trouble-stats", response_model=ProjectTroubleStatsResponse)
+def get_project_trouble_stats(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """
+    プロジェクトのお困りごと数をステータス別・カテゴリー別に取得する（集計テーブルから取得）
+    """
+    if not db.query(CoCreationProject.project_id).filter(CoCreationProject.project_id == project_id).first():
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
     
-    # プロジェクト作成者の情報取得
-    creator = db.query(User).filter(User.user_id == project.creator_user_id).first()
+    breakdown = [
+        TroubleStatusCount(category_id=row.category_id, status=row.status, count=row.trouble_count)
+        for row in project_trouble_breakdown(db, project_id)
+    ]
+    open_troubles = sum(item.count for item in breakdown if item.status == STATUS_OPEN)
+    resolved_troubles = sum(item.count for item in breakdown if item.status == STATUS_RESOLVED)
     
-    # カテゴリー情報の取得 (追加)
-    category = None
-    if hasattr(project, 'category_id') and project.category_id:
-        category = db.query(ProjectCategory).filter(
-            ProjectCategory.category_id == project.category_id
-        ).first()
+    return ProjectTroubleStatsResponse(
+        project_id=project_id,
+        open_troubles=open_troubles,
+        resolved_troubles=resolved_troubles,
+        total_troubles=sum(item.count for item in breakdown),
+        by_category=breakdown
+    )
+
+@router.get("/{project_id}/export")
+def export_project(
+    project_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="出力形式（ndjson または csv）"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """
+    プロジェクトのお困りごととメッセージを全件エクスポートする（作成者のみ）
+    件数に関わらずメモリ使用量が一定になるよう、サーバーサイドカーソルで読みながら逐次送信する
+    """
+    project = (
+        db.query(CoCreationProject.creator_user_id)
+        .filter(CoCreationProject.project_id == project_id)
+        .first()
+    )
+    if not project:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    if project.creator_user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="このプロジェクトをエクスポートする権限がありません"
+        )
     
-    return ProjectResponse(
-        project_id=project.project_id,
-        title=project.title,
-        summary=project.summary,
-        description=project.description,
-        creator_user_id=project.creator_user_id,
-        creator_name=creator.name if creator else "不明",
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-        likes=likes,
-        comments=comments,
-        is_favorite=is_favorite,
-        category_id=project.category_id if hasattr(project, 'category_id') else None,  # 追加
-            category=CategoryResponse(
-                category_id=category.category_id,
-                name=category.name
-            ) if category else None  # 追加
+    if format == "csv":
+        body, media_type = iter_project_csv(project_id), "text/csv; charset=utf-8"
+    else:
+        body, media_type = iter_project_ndjson(project_id), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.{format}"'}
     )
 
 @router.put("/{project_id}", response_model=ProjectResponse)
@@ -299,7 +435,7 @@ def update_project(
     project_id: int,
     project_update: ProjectUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
 ):
     """プロジェクトを更新"""
     db_project = db.query(CoCreationProject).filter(CoCreationProject.project_id == project_id).first()
@@ -319,10 +455,7 @@ def update_project(
     
     # カテゴリーが指定されている場合は存在確認 (追加)
     if hasattr(project_update, 'category_id') and project_update.category_id:
-        category = db.query(ProjectCategory).filter(
-            ProjectCategory.category_id == project_update.category_id
-        ).first()
-        if not category:
+        if not project_category_catalog.contains(db, project_update.category_id):
             raise HTTPException(
                 status_code=404,
                 detail="指定されたカテゴリーが見つかりません"
@@ -340,31 +473,108 @@ def update_project(
     db.commit()
     db.refresh(db_project)
     
-    # プロジェクト作成者の情報取得
-    creator = db.query(User).filter(User.user_id == db_project.creator_user_id).first()
-    
-    # カテゴリー情報の取得 (追加)
-    category = None
-    if hasattr(db_project, 'category_id') and db_project.category_id:
-        category = db.query(ProjectCategory).filter(
-            ProjectCategory.category_id == db_project.category_id
-        ).first()
-    
-    return ProjectResponse(
-        project_id=db_project.project_id,
-        title=db_project.title,
-        summary=db_project.summary,
-        description=db_project.description,
-        creator_user_id=db_project.creator_user_id,
-        creator_name=creator.name if creator else "不明",
-        created_at=db_project.created_at,
-        updated_at=db_project.updated_at,
-        likes=24,  # 仮の値
-        comments=8,  # 仮の値
-        is_favorite=False,  # 更新後のお気に入り状態は別途取得必要
-        category_id=db_project.category_id if hasattr(db_project, 'category_id') else None,  # 追加
-        category=CategoryResponse(
-            category_id=category.category_id,
-            name=category.name
-        ) if category else None  # 追加
-    )
\ No newline at end of file
+    # フィードに含まれる内容が変わるためキャッシュを無効化
+    invalidate_project_feed()
+    project_search_index.index_project(db_project)
+    
+    # 更新後のお気に入り状態は別途取得必要
+    trouble_counts = project_trouble_counts(db, [project_id]).get(project_id)
+    return to_project_response(db_project, project_category_catalog.snapshot(db), False, trouble_counts)
+
+
+@router.post("/{project_id}/like")
+def like_project(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """プロジェクトにいいねする（いいね済みの場合は何もしない）"""
+    project = db.query(CoCreationProject).filter(CoCreationProject.project_id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    
+    existing_like = db.query(UserProjectLike).filter(
+        UserProjectLike.user_id == current_user.user_id,
+        UserProjectLike.project_id == project_id
+    ).first()
+    
+    if not existing_like:
+        # いいねの登録とカウンターの加算を同一トランザクションで行う
+        db.add(UserProjectLike(user_id=current_user.user_id, project_id=project_id))
+        increment_project_counters(db, project_id, likes=1)
+        db.commit()
+        invalidate_project_feed()
+    
+    return {"message": "いいねしました", "likes": project.likes_count}
+
+@router.delete("/{project_id}/like")
+def unlike_project(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """プロジェクトのいいねを取り消す（未いいねの場合は何もしない）"""
+    project = db.query(CoCreationProject).filter(CoCreationProject.project_id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    
+    existing_like = db.query(UserProjectLike).filter(
+        UserProjectLike.user_id == current_user.user_id,
+        UserProjectLike.project_id == project_id
+    ).first()
+    
+    if existing_like:
+        # いいねの削除とカウンターの減算を同一トランザクションで行う
+        db.delete(existing_like)
+        increment_project_counters(db, project_id, likes=-1)
+        db.commit()
+        invalidate_project_feed()
+    
+    return {"message": "いいねを取り消しました", "likes": project.likes_count}
+
+
+@router.post("/{project_id}/favorite")
+def favorite_project(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """プロジェクトをお気に入りに登録する（登録済みの場合は何もしない）"""
+    project = db.query(CoCreationProject).filter(CoCreationProject.project_id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    
+    existing_favorite = db.query(UserProjectFavorite).filter(
+        UserProjectFavorite.user_id == current_user.user_id,
+        UserProjectFavorite.project_id == project_id
+    ).first()
+    
+    if not existing_favorite:
+        db.add(UserProjectFavorite(user_id=current_user.user_id, project_id=project_id))
+        db.commit()
+    
+    # 他ワーカーでの変更で古くなっている場合も含め、メモリ上のお気に入りに反映
+    favorite_store.add(current_user.user_id, project_id)
+    invalidate_project_feed(current_user.user_id)
+    
+    return {"message": "お気に入りに登録しました", "is_favorite": True}
+
+@router.delete("/{project_id}/favorite")
+def unfavorite_project(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+):
+    """プロジェクトのお気に入りを解除する（未登録の場合は何もしない）"""
+    deleted = db.query(UserProjectFavorite).filter(
+        UserProjectFavorite.user_id == current_user.user_id,
+        UserProjectFavorite.project_id == project_id
+    ).delete(synchronize_session=False)
+    db.commit()
+    
+    # 他ワーカーでの変更で古くなっている場合も含め、メモリ上のお気に入りに反映
+    favorite_store.remove(current_user.user_id, project_id)
+    if deleted:
+        invalidate_project_feed(current_user.user_id)
+    
+    return {"message": "お気に入りを解除しました", "is_favorite": False}
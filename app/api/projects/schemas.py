@@ -39,6 +39,8 @@ class ProjectResponse(BaseModel):
     updated_at: Optional[datetime] = None
     likes: int = 0
     comments: int = 0
+    open_troubles: int = 0  # 未解決のお困りごと数
+    resolved_troubles: int = 0  # 解決済みのお困りごと数
     is_favorite: bool = False
     category_id: Optional[int] = None  # 追加: カテゴリーIDフィールド
     category: Optional[CategoryResponse] = None  # 追加: カテゴリー情報
@@ -51,6 +53,29 @@ class ProjectListResponse(BaseModel):
     favorite_projects: List[ProjectResponse]
     total_projects: int
 
+class ProjectImportResult(BaseModel):
+    index: int  # 入力配列（NDJSONの場合は行）の位置
+    status: str  # "created" または "error"
+    project_id: Optional[int] = None
+    error: Optional[str] = None
+
+class ProjectBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ProjectImportResult]
+
+class TroubleStatusCount(BaseModel):
+    category_id: int
+    status: str
+    count: int
+
+class ProjectTroubleStatsResponse(BaseModel):
+    project_id: int
+    open_troubles: int  # 未解決のお困りごと数
+    resolved_troubles: int  # 解決済みのお困りごと数
+    total_troubles: int
+    by_category: List[TroubleStatusCount]  # カテゴリー・ステータス別の内訳
+
 class UserProjectFavoriteCreate(BaseModel):
     user_id: int
     project_id: int
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.etag import etag_matches, not_modified_response
+from app.services.category_catalog import trouble_category_catalog
 from app.api.users.models import User
 from app.api.troubles.models import TroubleCategory
 from app.api.troubles.schemas import TroubleCategoryResponse
@@ -12,33 +14,42 @@ from app.api.troubles.schemas import TroubleCategoryCreate
 router = APIRouter()
 
 @router.get("", response_model=List[TroubleCategoryResponse])
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     すべてのお困りごとカテゴリーを取得します。
+    メモリ上のカタログから返し、If-None-Match が一致する場合は304を返します。
     """
-    categories = db.query(TroubleCategory).all()
+    snapshot = trouble_category_catalog.snapshot(db)
+    if etag_matches(request, snapshot.etag):
+        return not_modified_response(snapshot.etag)
     
+    response.headers["ETag"] = snapshot.etag
     return [
         TroubleCategoryResponse(
-            category_id=category.category_id,
-            name=category.name
-        ) for category in categories
+            category_id=category_id,
+            name=name
+        ) for category_id, name in snapshot.items
     ]
 
 @router.get("/{category_id}", response_model=TroubleCategoryResponse)
-def get_category(category_id: int, db: Session = Depends(get_db)):
+def get_category(category_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     特定のカテゴリーを取得します。
     """
-    category = db.query(TroubleCategory).filter(TroubleCategory.category_id == category_id).first()
-    if not category:
+    snapshot = trouble_category_catalog.snapshot(db)
+    name = snapshot.get_name(category_id)
+    if name is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="カテゴリーが見つかりません"
         )
+    if etag_matches(request, snapshot.etag):
+        return not_modified_response(snapshot.etag)
+    
+    response.headers["ETag"] = snapshot.etag
     return TroubleCategoryResponse(
-        category_id=category.category_id,
-        name=category.name
+        category_id=category_id,
+        name=name
     )
 
 @router.post("", response_model=TroubleCategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -74,6 +85,7 @@ def create_category(
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    trouble_category_catalog.invalidate()
     
     return TroubleCategoryResponse(
         category_id=db_category.category_id,
@@ -124,6 +136,7 @@ def update_category(
     db_category.name = category.name
     db.commit()
     db.refresh(db_category)
+    trouble_category_catalog.invalidate()
     
     return TroubleCategoryResponse(
         category_id=db_category.category_id,
@@ -167,5 +180,6 @@ def delete_category(
     # カテゴリーを削除
     db.delete(db_category)
     db.commit()
+    trouble_category_catalog.invalidate()
     
     return None
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, PrimaryKeyConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -15,6 +15,13 @@ class TroubleCategory(Base):
 
 class Trouble(Base):
     __tablename__ = "troubles"
+    __table_args__ = (
+        # 一覧のカーソルページング用（作成日時降順 + ID）
+        Index("ix_troubles_created_at_trouble_id", "created_at", "trouble_id"),
+        # 一覧の絞り込み + 作成日時順の並び替え用
+        Index("ix_troubles_project_id_status_created_at", "project_id", "status", "created_at"),
+        Index("ix_troubles_category_id_created_at", "category_id", "created_at"),
+    )
 
     trouble_id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("co_creation_projects.project_id"), nullable=False)
@@ -22,12 +29,32 @@ class Trouble(Base):
     creator_user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)  # 名前を統一: author_id → creator_user_id
     description = Column(Text, nullable=False)   
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-#    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     status = Column(String, default="未解決")
+    # 一覧表示用の非正規化コメント数（メッセージ書き込み時に同一トランザクションで更新）
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # 行バージョン（ORMでの更新ごとに加算され、ETagの生成に使用）
+    row_version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # リレーションシップ
     project = relationship("CoCreationProject", back_populates="troubles")
     author = relationship("User", back_populates="troubles")
     category = relationship("TroubleCategory", back_populates="troubles")  # この行を追加
     # メッセージ機能を実装する場合
-    messages = relationship("Message", back_populates="trouble")
\ No newline at end of file
+    messages = relationship("Message", back_populates="trouble")
+
+    __mapper_args__ = {"version_id_col": row_version}
+
+class TroubleStatusSummary(Base):
+    """
+    プロジェクト・カテゴリー・ステータスごとのお困りごと件数（お困りごとの作成・更新・削除時に同一トランザクションで更新）
+    """
+    __tablename__ = "trouble_status_summary"
+    __table_args__ = (
+        PrimaryKeyConstraint("project_id", "category_id", "status"),
+    )
+
+    project_id = Column(Integer, ForeignKey("co_creation_projects.project_id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("trouble_categories.category_id"), nullable=False)
+    status = Column(String(20), nullable=False)
+    trouble_count = Column(Integer, nullable=False, default=0, server_default="0")
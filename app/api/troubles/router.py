@@ -1,15 +1,28 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional, Set
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime
 
 # 相対インポートを修正
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.api.users.models import User
+from app.core.dependencies import get_current_user_snapshot
+from app.core.token_cache import UserSnapshot
+from app.core.pagination import encode_cursor, keyset_filter, next_cursor_for
+from app.core.etag import etag_matches, make_etag, not_modified_response
 from app.api.projects.models import CoCreationProject
-from app.api.troubles.models import Trouble
+from app.api.troubles.models import Trouble, TroubleCategory
+from app.services.category_catalog import trouble_category_catalog
+from app.services.troubles import trouble_etag, trouble_list_query, to_trouble_response
+from app.services.list_counts import count_troubles, invalidate_trouble_counts
+from app.services.trouble_stats import adjust_trouble_status_counts, status_key
+from app.services.projects import (
+    invalidate_project_feed,
+    project_detail_state,
+    project_response_options
+)
+from app.services.messages import message_thread_query, to_message_response
+from app.services.helper_matcher import helper_matcher
 
 from . import schemas
 
@@ -19,7 +32,7 @@ router = APIRouter()
 @router.post("/", response_model=schemas.TroubleResponse)
 def create_trouble(
     trouble: schemas.TroubleCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
     db: Session = Depends(get_db)
 ):
     # プロジェクトが存在するか確認
@@ -38,8 +51,12 @@ def create_trouble(
     )
     
     db.add(new_trouble)
+    # プロジェクトのステータス別件数を同一トランザクションで更新
+    adjust_trouble_status_counts(db, added=status_key(new_trouble))
     db.commit()
     db.refresh(new_trouble)
+    invalidate_trouble_counts()
+    invalidate_project_feed()
     
     return schemas.TroubleResponse(
         trouble_id=new_trouble.trouble_id,
@@ -60,7 +77,7 @@ def create_trouble_simple(
     category_id: int,
     description: str,
     status: Optional[str] = "未解決",
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
     db: Session = Depends(get_db)
 ):
     """
@@ -82,8 +99,12 @@ def create_trouble_simple(
     )
     
     db.add(new_trouble)
+    # プロジェクトのステータス別件数を同一トランザクションで更新
+    adjust_trouble_status_counts(db, added=status_key(new_trouble))
     db.commit()
     db.refresh(new_trouble)
+    invalidate_trouble_counts()
+    invalidate_project_feed()
     
     return {
         "trouble_id": new_trouble.trouble_id,
@@ -96,105 +117,222 @@ def get_troubles(
     project_id: int = Query(None, description="特定のプロジェクトのお困りごとを取得"),
     category_id: Optional[int] = Query(None, description="カテゴリでフィルタリング"),
     status: Optional[str] = Query(None, description="状態でフィルタリング"),
-    skip: int = 0,
-    limit: int = 10,
-    current_user: User = Depends(get_current_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="前ページの next_cursor（指定時は skip を無視してカーソル位置から取得）"),
+    include_total: bool = Query(True, description="総数を取得するか（無限スクロールでは false で COUNT を省略）"),
+    approximate_total: bool = Query(False, description="キャッシュ済み・統計情報による概算の総数を許容するか"),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
     db: Session = Depends(get_db)
 ):
-    # クエリ作成
-    query = db.query(Trouble)
+    return _troubles_page(db, project_id, category_id, status, skip, limit, cursor, include_total, approximate_total)
+
+def _troubles_page(
+    db: Session,
+    project_id: Optional[int],
+    category_id: Optional[int],
+    status: Optional[str],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    include_total: bool,
+    approximate_total: bool
+) -> schemas.TroublesListResponse:
+    """
+    お困りごと一覧の1ページを取得する
+    """
+    # 絞り込み条件（複合インデックス (project_id, status, created_at) / (category_id, created_at) で処理）
+    filters = []
     
     # プロジェクトIDによるフィルタリング
     if project_id:
-        query = query.filter(Trouble.project_id == project_id)
+        filters.append(Trouble.project_id == project_id)
     
     # カテゴリによるフィルタリング
     if category_id:
-        query = query.filter(Trouble.category_id == category_id)
+        filters.append(Trouble.category_id == category_id)
     
     # 状態によるフィルタリング
     if status:
-        query = query.filter(Trouble.status == status)
+        filters.append(Trouble.status == status)
     
-    # 作成日時で降順ソート
-    query = query.order_by(Trouble.created_at.desc())
+    # 総数取得（要求された場合のみ、絞り込み条件ごとにキャッシュ）
+    total, total_is_approximate = None, False
+    if include_total:
+        total, total_is_approximate = count_troubles(
+            db, project_id, category_id, status, approximate=approximate_total
+        )
     
-    # 総数取得
-    total = query.count()
+    # プロジェクト名・作成者名をJOINした1回のクエリで取得
+    # 作成日時で降順ソート（同一日時はIDで順序を確定）
+    query = (
+        trouble_list_query(db)
+        .filter(*filters)
+        .order_by(Trouble.created_at.desc(), Trouble.trouble_id.desc())
+    )
     
-    # ページネーション適用
-    troubles = query.offset(skip).limit(limit).all()
+    # ページネーション適用（カーソル指定時はインデックスの範囲検索）
+    if cursor:
+        query = query.filter(keyset_filter(Trouble.created_at, Trouble.trouble_id, cursor))
+    else:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+    next_cursor = next_cursor_for(rows, limit, "created_at", "trouble_id")
     
     # レスポンス形式に変換
-    trouble_list = []
-    for trouble in troubles:
-        # プロジェクト情報取得
-        project = db.query(CoCreationProject).filter(CoCreationProject.project_id == trouble.project_id).first()
-        
-       
-        # コメント数取得（メッセージとして扱う）
-        # comments_count = db.query(TroubleMessage).filter(TroubleMessage.trouble_id == trouble.trouble_id).count()
-        comments_count = 0  # 仮実装
-        
-        trouble_list.append(schemas.TroubleResponse(
-            trouble_id=trouble.trouble_id,
-            description=trouble.description,
-            category_id=trouble.category_id,
-            project_id=trouble.project_id,
-            project_title=project.title if project else "Unknown Project",
-            creator_user_id=trouble.creator_user_id,
-            creator_name=creator.name if creator else "Unknown User",
-            created_at=trouble.created_at,
-            status=trouble.status,
-            comments=comments_count
-        ))
+    trouble_list = [to_trouble_response(row) for row in rows[:limit]]
     
     return schemas.TroublesListResponse(
         troubles=trouble_list,
-        total=total
+        total=total,
+        total_is_approximate=total_is_approximate,
+        next_cursor=next_cursor
     )
 
+# "/{trouble_id}" より前に定義しないとパスが一致せず到達できない
+@router.get("/categories", response_model=List[schemas.TroubleCategoryResponse])
+def get_trouble_categories(
+    request: Request,
+    response: Response,
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
+    db: Session = Depends(get_db)
+):
+    # カタログ（メモリ）からカテゴリを取得 - トラブルカテゴリテーブルを使用する
+    snapshot = trouble_category_catalog.snapshot(db)
+    
+    # カテゴリがない場合は初期データを挿入
+    if not snapshot.items:
+        default_categories = [
+            "UI/UXデザイン", "コンテンツ制作", "モバイル開発", "技術相談", "マーケティング"
+        ]
+        
+        for name in default_categories:
+            category = TroubleCategory(name=name)
+            db.add(category)
+        
+        db.commit()
+        trouble_category_catalog.invalidate()
+        snapshot = trouble_category_catalog.snapshot(db)
+    
+    if etag_matches(request, snapshot.etag):
+        return not_modified_response(snapshot.etag)
+    
+    response.headers["ETag"] = snapshot.etag
+    return [
+        schemas.TroubleCategoryResponse(
+            category_id=category_id,
+            name=name
+        ) for category_id, name in snapshot.items
+    ]
+
+# 詳細と同時に取得できる関連データ
+DETAIL_INCLUDES = {"messages", "project"}
+
 @router.get("/{trouble_id}", response_model=schemas.TroubleDetailResponse)
 def get_trouble_detail(
     trouble_id: int,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    include: Optional[str] = Query(None, description="同時に取得する関連データ（messages, project のカンマ区切り）"),
+    messages_limit: int = Query(20, ge=1, le=100, description="include=messages の場合の取得件数"),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
     db: Session = Depends(get_db)
 ):
-    # お困りごと取得
-    trouble = db.query(Trouble).filter(Trouble.trouble_id == trouble_id).first()
-    if not trouble:
-        raise HTTPException(status_code=404, detail="お困りごとが見つかりません")
+    """
+    お困りごとの詳細を取得する
+    include=messages,project を指定すると、スレッドの最初のページとプロジェクトも1回のリクエストで返す
+    """
+    includes = {name.strip() for name in include.split(",") if name.strip()} if include else set()
+    unknown = includes - DETAIL_INCLUDES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"include に指定できない値です: {', '.join(sorted(unknown))}")
     
-    # プロジェクト情報取得
-    project = db.query(CoCreationProject).filter(CoCreationProject.project_id == trouble.project_id).first()
+    return _trouble_detail(db, trouble_id, request, response, includes, messages_limit, current_user.user_id)
+
+def _trouble_detail(
+    db: Session,
+    trouble_id: int,
+    request: Request,
+    response: Response,
+    includes: Set[str],
+    messages_limit: int,
+    user_id: int
+):
+    """
+    お困りごとの詳細を取得する（include の検証後の処理）
+    """
+    # 変更がなければ詳細の取得・変換を行わずに304を返す
+    etag = trouble_etag(db, trouble_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="お困りごとが見つかりません")
+    if includes:
+        # メッセージの追加はコメント数としてお困りごとのETagに反映済み、プロジェクトは個別に確認する
+        project_state = None
+        if "project" in includes:
+            project_id = db.query(Trouble.project_id).filter(Trouble.trouble_id == trouble_id).scalar()
+            project_state = project_detail_state(db, project_id, user_id)
+        etag = make_etag(etag, sorted(includes), messages_limit, project_state.etag if project_state else None)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
     
-    # 作成者情報取得
-    creator = db.query(User).filter(User.user_id == trouble.creator_user_id).first()
+    # お困りごと取得（プロジェクト名・作成者名はJOINで同時に取得）
+    row = trouble_list_query(db).filter(Trouble.trouble_id == trouble_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="お困りごとが見つかりません")
     
-    # コメント数取得（メッセージとして扱う）
-    # comments_count = db.query(TroubleMessage).filter(TroubleMessage.trouble_id == trouble.trouble_id).count()
-    comments_count = 0  # 仮実装
+    extra = {}
+    if "messages" in includes:
+        # スレッドの最初のページ（投稿者名はJOINで同時に取得）
+        rows = message_thread_query(db, trouble_id).limit(messages_limit + 1).all()
+        extra["messages_next_cursor"] = next_cursor_for(rows, messages_limit, "created_at", "id")
+        rows = rows[:messages_limit]
+        extra["messages"] = [to_message_response(message) for message in rows]
+        extra["messages_latest_cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id) if rows else None
+    if "project" in includes:
+        project = (
+            db.query(CoCreationProject)
+            .options(*project_response_options())
+            .filter(CoCreationProject.project_id == row.project_id)
+            .first()
+        )
+        if project and project_state:
+            # お気に入り判定・お困りごと数はETagの計算時に取得した値を使う
+            extra["project"] = project_state.to_response(project)
     
-    return schemas.TroubleDetailResponse(
-        trouble_id=trouble.trouble_id,
-        description=trouble.description,
-        category_id=trouble.category_id,
-        project_id=trouble.project_id,
-        project_title=project.title if project else "Unknown Project",
-        creator_user_id=trouble.creator_user_id,
-        creator_name=creator.name if creator else "Unknown User",
-        created_at=trouble.created_at,
-        status=trouble.status,
-        comments=comments_count,
-        # メッセージ機能が実装されていることを前提とする
-        # messages=[]  # 必要に応じてメッセージ一覧を取得
+    response.headers["ETag"] = etag
+    return to_trouble_response(row, schemas.TroubleDetailResponse, **extra)
+
+@router.get("/{trouble_id}/helpers", response_model=List[schemas.HelperCandidate])
+def get_trouble_helpers(
+    trouble_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
+    db: Session = Depends(get_db)
+):
+    """
+    お困りごとのカテゴリーに興味のあるユーザーを、ポイントの高い順に回答候補者として取得する
+    （作成者本人は除く）
+    """
+    trouble = (
+        db.query(Trouble.category_id, Trouble.creator_user_id)
+        .filter(Trouble.trouble_id == trouble_id)
+        .first()
     )
+    if not trouble:
+        raise HTTPException(status_code=404, detail="お困りごとが見つかりません")
+    
+    category_name = trouble_category_catalog.snapshot(db).get_name(trouble.category_id)
+    if category_name is None:
+        return []
+    
+    helper_matcher.ensure_loaded(db)
+    return helper_matcher.candidates(category_name, limit, exclude_user_ids=[trouble.creator_user_id])
 
 @router.put("/{trouble_id}", response_model=schemas.TroubleResponse)
 def update_trouble(
     trouble_id: int,
     trouble_update: schemas.TroubleUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
     db: Session = Depends(get_db)
 ):
     # お困りごと取得
@@ -207,17 +345,24 @@ def update_trouble(
         raise HTTPException(status_code=403, detail="自分のお困りごとのみ更新できます")
     
     # 更新処理
+    previous_key = status_key(trouble)
     if trouble_update.description is not None:
         trouble.description = trouble_update.description
-    if trouble_update.category is not None:
-        trouble.category_id = trouble_update.category
+    if trouble_update.category_id is not None:
+        if not trouble_category_catalog.contains(db, trouble_update.category_id):
+            raise HTTPException(status_code=404, detail="指定されたカテゴリーが見つかりません")
+        trouble.category_id = trouble_update.category_id
     if trouble_update.status is not None:
         if trouble_update.status not in ["未解決", "解決"]:
             raise HTTPException(status_code=400, detail="ステータスは「未解決」または「解決」のみ設定可能です")
         trouble.status = trouble_update.status
     
+    # カテゴリー・ステータスが変わった場合はステータス別件数を付け替える
+    adjust_trouble_status_counts(db, removed=previous_key, added=status_key(trouble))
     db.commit()
     db.refresh(trouble)
+    invalidate_trouble_counts()
+    invalidate_project_feed()
     
     # プロジェクト情報取得
     project = db.query(CoCreationProject).filter(CoCreationProject.project_id == trouble.project_id).first()
@@ -232,13 +377,13 @@ def update_trouble(
         creator_name=current_user.name,
         created_at=trouble.created_at,
         status=trouble.status,
-        comments=0  # 仮実装
+        comments=trouble.comments_count
     )
 
 @router.delete("/{trouble_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_trouble(
     trouble_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
     db: Session = Depends(get_db)
 ):
     # お困りごと取得
@@ -251,37 +396,10 @@ def delete_trouble(
         raise HTTPException(status_code=403, detail="自分のお困りごとのみ削除できます")
     
     # 削除
+    adjust_trouble_status_counts(db, removed=status_key(trouble))
     db.delete(trouble)
     db.commit()
+    invalidate_trouble_counts()
+    invalidate_project_feed()
     
     return None
-
-@router.get("/categories", response_model=List[schemas.TroubleCategoryResponse])
-def get_trouble_categories(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    # データベースからカテゴリを取得 - トラブルカテゴリテーブルを使用する
-    from ...api.troubles.models import TroubleCategory
-    
-    categories = db.query(TroubleCategory).all()
-    
-    # カテゴリがない場合は初期データを挿入
-    if not categories:
-        default_categories = [
-            "UI/UXデザイン", "コンテンツ制作", "モバイル開発", "技術相談", "マーケティング"
-        ]
-        
-        for name in default_categories:
-            category = TroubleCategory(name=name)
-            db.add(category)
-        
-        db.commit()
-        categories = db.query(TroubleCategory).all()
-    
-    return [
-        schemas.TroubleCategoryResponse(
-            category_id=category.category_id,
-            name=category.name
-        ) for category in categories
-    ]
\ No newline at end of file
@@ -2,6 +2,9 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import List, Optional
 
+from app.api.messages.schemas import MessageResponse
+from app.api.projects.schemas import ProjectResponse
+
     
 class TroubleCreate(BaseModel):
     project_id: int = Field(..., description="関連するプロジェクトID")
@@ -31,13 +34,24 @@ class TroubleResponse(BaseModel):
         orm_mode = True
 
 class TroubleDetailResponse(TroubleResponse):
-    # メッセージ関連の情報を追加する場合
-    # messages: List[MessageResponse] = []
-    pass
+    # include=messages 指定時のみ設定（スレッドの最初のページ）
+    messages: Optional[List[MessageResponse]] = None
+    messages_next_cursor: Optional[str] = None  # GET /messages/trouble/{trouble_id} の cursor に指定して続きを取得
+    messages_latest_cursor: Optional[str] = None  # 同じく cursor に指定すると新着のみ取得
+    # include=project 指定時のみ設定
+    project: Optional[ProjectResponse] = None
+
+class HelperCandidate(BaseModel):
+    user_id: int
+    name: str
+    points: int
+    categories: List[str]
 
 class TroublesListResponse(BaseModel):
     troubles: List[TroubleResponse]
-    total: int
+    total: Optional[int] = None  # include_total=false の場合は省略
+    total_is_approximate: bool = False  # approximate_total=true で概算値を返した場合はTrue
+    next_cursor: Optional[str] = None  # 次ページ取得用のカーソル（続きがない場合はNone）
     
 class TroubleCategoryResponse(BaseModel):
     category_id: int
@@ -14,12 +14,14 @@ class User(Base):
     category_id = Column(Integer, ForeignKey("project_categories.category_id"))
     num_answer = Column(Integer) 
     point_total = Column(Integer, default=0) 
+    categories = Column(Text, nullable=True)  # 興味/専門カテゴリー（カンマ区切り、get_categories_list で参照）
     #created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_login_at = Column(DateTime, nullable=False)  
     
     # リレーションシップ - 文字列で参照する
     projects = relationship("CoCreationProject", back_populates="creator")  # ← 修正
     favorite_projects = relationship("UserProjectFavorite", back_populates="user")  # ← 修正
+    liked_projects = relationship("UserProjectLike", back_populates="user")
     participating_projects = relationship("UserProjectParticipation", back_populates="user")  # ← 追加
     messages = relationship("Message", back_populates="user")
     troubles = relationship("Trouble", back_populates="author")
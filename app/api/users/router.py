@@ -4,10 +4,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import get_password_hash
+from app.core.security import hash_password_in_pool
 from app.core.dependencies import get_current_user
 from app.api.users.models import User
 from app.api.users.schemas import UserCreate, UserResponse, UserUpdate
+from app.services.leaderboard import leaderboard
+from app.services.helper_matcher import helper_matcher
+from app.core.token_cache import token_cache
 
 router = APIRouter()
 
@@ -26,8 +29,7 @@ def get_current_user_info(
         "id": current_user.user_id,
         "name": current_user.name,
         "categories": categories,
-        "points": current_user.points,
-        "created_at": current_user.created_at
+        "points": current_user.point_total or 0,
     }
 
 @router.put("/me", response_model=UserResponse)
@@ -58,7 +60,8 @@ def update_user_info(
     
     # パスワードの更新（入力されている場合）
     if user_data.password:
-        current_user.password = get_password_hash(user_data.password) #hashed_passwordをpasswordに変更
+        # ハッシュ計算は同時実行数を制限した専用のスレッドプールで行う
+        current_user.password = hash_password_in_pool(user_data.password) #hashed_passwordをpasswordに変更
     
     # カテゴリーの更新（入力されている場合）
     if user_data.categories is not None:
@@ -68,16 +71,25 @@ def update_user_info(
     db.commit()
     db.refresh(current_user)
     
+    # キャッシュ済みのトークンから古い名前が返らないよう破棄
+    token_cache.invalidate_user(current_user.user_id)
+    
+    # ランキング上の表示名を更新
+    leaderboard.update(current_user.user_id, current_user.name, current_user.point_total)
+    # 回答候補者のカテゴリー索引を更新
+    helper_matcher.update_user(
+        current_user.user_id, current_user.name, current_user.point_total, current_user.categories
+    )
+    
     # カテゴリーをリストに変換
     categories = current_user.get_categories_list()
     
     # レスポンスを構築
     return {
-        "id": current_user.id,
+        "id": current_user.user_id,
         "name": current_user.name,
         "categories": categories,
-        "points": current_user.points,
-        "created_at": current_user.created_at
+        "points": current_user.point_total or 0,
     }
 
 @router.get("/categories", response_model=List[str])
@@ -21,7 +21,8 @@ class UserResponse(UserBase):
     id: int
     categories: List[str]
     points: int = 0
-    created_at: datetime
+    # users テーブルに作成日時の列がないため、現在は返さない
+    created_at: Optional[datetime] = None
     
     class Config:
         orm_mode = True
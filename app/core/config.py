@@ -38,6 +38,20 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your_secret_key_here")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
+    # パスワードハッシュ設定（コストを変更すると、次回ログイン時に新しいコストで再ハッシュされる）
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+
+    # ログイン試行制限（トークンバケット: 容量 = 連続で試行できる回数、毎分の補充数）
+    LOGIN_THROTTLE_ENABLED: bool = os.getenv("LOGIN_THROTTLE_ENABLED", "True").lower() == "true"
+    LOGIN_THROTTLE_BACKEND: str = os.getenv("LOGIN_THROTTLE_BACKEND", "local")
+    LOGIN_THROTTLE_USERNAME_BURST: int = int(os.getenv("LOGIN_THROTTLE_USERNAME_BURST", "10"))
+    LOGIN_THROTTLE_USERNAME_PER_MINUTE: float = float(os.getenv("LOGIN_THROTTLE_USERNAME_PER_MINUTE", "5"))
+    LOGIN_THROTTLE_IP_BURST: int = int(os.getenv("LOGIN_THROTTLE_IP_BURST", "30"))
+    LOGIN_THROTTLE_IP_PER_MINUTE: float = float(os.getenv("LOGIN_THROTTLE_IP_PER_MINUTE", "20"))
+    LOGIN_THROTTLE_MAX_KEYS: int = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+    # 運用向けの統計エンドポイント（/admin/*）を利用できるユーザーID（カンマ区切り。未指定の場合は誰も利用できない）
+    ADMIN_USER_IDS_STR: str = os.getenv("ADMIN_USER_IDS", "")
     
     # データベース設定
     DB_HOST: str = os.getenv("DB_HOST", "localhost")
@@ -45,10 +59,54 @@ class Settings(BaseSettings):
     DB_USER: str = os.getenv("DB_USER", "root")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
     DB_NAME: str = os.getenv("DB_NAME", "collabo_db")
+    # 接続文字列を直接指定する場合（例: テスト用の sqlite:///./test.db / sqlite+aiosqlite:///./test.db）
+    # 未指定の場合は上記のMySQL設定から組み立てる
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    # 接続プール設定（ワーカーごと。同期・非同期のエンジンそれぞれがこの設定でプールを持つ）
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    # MySQL の wait_timeout より短くし、サーバー側で切断された接続を使わないようにする
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    # 貸し出し前に接続を確認し、切断済みであれば張り直す
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    DB_CONNECT_TIMEOUT_SECONDS: int = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "10"))
     
     # CORS設定
     CORS_ORIGINS_STR: str = Field(default="http://localhost:3000")
     
+    # 一括登録設定
+    PROJECT_BULK_MAX_ITEMS: int = int(os.getenv("PROJECT_BULK_MAX_ITEMS", "5000"))
+    PROJECT_BULK_CHUNK_SIZE: int = int(os.getenv("PROJECT_BULK_CHUNK_SIZE", "500"))
+    
+    # キャッシュ設定（秒）
+    PROJECT_FEED_CACHE_TTL_SECONDS: int = int(os.getenv("PROJECT_FEED_CACHE_TTL_SECONDS", "60"))
+    CATEGORY_CATALOG_TTL_SECONDS: int = int(os.getenv("CATEGORY_CATALOG_TTL_SECONDS", "300"))
+    FAVORITE_STORE_TTL_SECONDS: int = int(os.getenv("FAVORITE_STORE_TTL_SECONDS", "300"))
+    LIST_COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("LIST_COUNT_CACHE_TTL_SECONDS", "30"))
+    LIST_COUNT_APPROXIMATE_TTL_SECONDS: int = int(os.getenv("LIST_COUNT_APPROXIMATE_TTL_SECONDS", "600"))
+    
+    # 認証済みトークンのキャッシュ設定
+    TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    
+    # バックグラウンドジョブ設定（0以下で無効）
+    PROJECT_COUNTER_RECONCILE_INTERVAL_SECONDS: int = int(os.getenv("PROJECT_COUNTER_RECONCILE_INTERVAL_SECONDS", "3600"))
+    LEADERBOARD_REBUILD_INTERVAL_SECONDS: int = int(os.getenv("LEADERBOARD_REBUILD_INTERVAL_SECONDS", "600"))
+    SEARCH_INDEX_REBUILD_INTERVAL_SECONDS: int = int(os.getenv("SEARCH_INDEX_REBUILD_INTERVAL_SECONDS", "1800"))
+    HELPER_MATCHER_REBUILD_INTERVAL_SECONDS: int = int(os.getenv("HELPER_MATCHER_REBUILD_INTERVAL_SECONDS", "600"))
+    
+    # リアルタイム配信設定（複数ワーカーで共有する場合は "broker" にしてローカルブローカーを起動）
+    PUBSUB_BACKEND: str = os.getenv("PUBSUB_BACKEND", "inprocess")
+    PUBSUB_BROKER_HOST: str = os.getenv("PUBSUB_BROKER_HOST", "127.0.0.1")
+    PUBSUB_BROKER_PORT: int = int(os.getenv("PUBSUB_BROKER_PORT", "8765"))
+    
+    # メッセージ受付キュー設定（POST /messages/ingest）
+    MESSAGE_INGEST_QUEUE_SIZE: int = int(os.getenv("MESSAGE_INGEST_QUEUE_SIZE", "10000"))
+    MESSAGE_INGEST_BATCH_SIZE: int = int(os.getenv("MESSAGE_INGEST_BATCH_SIZE", "500"))
+    MESSAGE_INGEST_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("MESSAGE_INGEST_FLUSH_INTERVAL_SECONDS", "0.2"))
+    
     # 開発環境フラグ
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     
@@ -61,10 +119,23 @@ class Settings(BaseSettings):
     def CORS_ORIGINS(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS_STR.split(",")]
     
+    @property
+    def ADMIN_USER_IDS(self) -> List[int]:
+        return [int(user_id) for user_id in self.ADMIN_USER_IDS_STR.split(",") if user_id.strip()]
+    
     # SQLAlchemy接続文字列もプロパティとして実装
     @property
     def SQLALCHEMY_DATABASE_URL(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+    
+    # 非同期ドライバー（aiomysql）の接続文字列
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URL(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
 # 設定のインスタンスを作成
 settings = Settings()
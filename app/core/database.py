@@ -1,18 +1,66 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.pool_metrics import PoolMetrics, instrumented_pool_class
+
+def _engine_options(url: str, pool_class, metrics: PoolMetrics) -> dict:
+    """
+    同期・非同期のエンジンに共通の接続プール設定
+    SQLite（テスト・ベンチマーク用）ではMySQL向けの接続オプションを使わない
+    （インメモリのデータベースは接続ごとに別のデータベースになるため、プール設定も使わない）
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            return dict(connect_args={"check_same_thread": False})
+        connect_args = {"check_same_thread": False}
+    else:
+        connect_args = {"connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+    return dict(
+        poolclass=instrumented_pool_class(pool_class, metrics),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+# 接続プールの計測値（管理用エンドポイントで参照する）
+pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
 
 # データベースエンジンの作成
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URL,
-    echo=settings.DEBUG  # デバッグモードの場合、SQLクエリをコンソールに表示
+    echo=settings.DEBUG,  # デバッグモードの場合、SQLクエリをコンソールに表示
+    **_engine_options(settings.SQLALCHEMY_DATABASE_URL, QueuePool, pool_metrics)
 )
+pool_metrics.attach(engine)
 
 # セッションファクトリの作成
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 非同期エンジン（async def のエンドポイント用。同期のエンジンとは別の接続プールを持つ）
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URL,
+    echo=settings.DEBUG,
+    **_engine_options(settings.SQLALCHEMY_ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, async_pool_metrics)
+)
+async_pool_metrics.attach(async_engine.sync_engine)
+
+# 非同期セッションファクトリ（コミット後も取得済みの値をそのまま使えるよう期限切れにしない）
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # モデルのベースクラス
 Base = declarative_base()
 
@@ -25,4 +73,12 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """
+    依存性注入用の非同期データベースセッション取得関数
+    async def のエンドポイントで使用する（接続は最初のクエリ実行時に取得される）
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
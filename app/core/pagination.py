@@ -0,0 +1,65 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    (作成日時, ID) を不透明なカーソル文字列にエンコードする
+    """
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    カーソル文字列を (作成日時, ID) にデコードする
+
+    :raises: 不正なカーソルの場合は400のHTTPException
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルが不正です"
+        )
+
+
+def keyset_filter(created_at_column, id_column, cursor: str, descending: bool = True):
+    """
+    カーソル位置より後ろの行を取得するための条件式を作成する
+    (作成日時, ID) の複合インデックスを範囲検索できる形で展開する
+
+    :param created_at_column: 並び順の第1キーとなる作成日時カラム
+    :param id_column: 同一日時の並びを確定させるIDカラム
+    :param cursor: 前ページ末尾のカーソル
+    :param descending: 降順で並べている場合はTrue
+    """
+    created_at, row_id = decode_cursor(cursor)
+    if descending:
+        return or_(
+            created_at_column < created_at,
+            and_(created_at_column == created_at, id_column < row_id)
+        )
+    return or_(
+        created_at_column > created_at,
+        and_(created_at_column == created_at, id_column > row_id)
+    )
+
+
+def next_cursor_for(rows, limit: int, created_at_attr: str, id_attr: str) -> Optional[str]:
+    """
+    limit + 1 件取得した結果から次ページのカーソルを求める
+    続きがない場合はNone
+    """
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(getattr(last, created_at_attr), getattr(last, id_attr))
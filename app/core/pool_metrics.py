@@ -0,0 +1,132 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+# 接続待ち時間のヒストグラムの区切り（ミリ秒、各区切り以下の件数を数える）
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """
+    接続プールの計測値
+    - 接続の取得にかかった待ち時間のヒストグラムとタイムアウト件数
+    - 開いている接続ごとの接続時刻（接続の経過時間の集計用）
+    - 接続・切断・無効化の件数
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._timeouts = 0
+        # id(DBAPI接続) → 接続時刻
+        self._connected_at: Dict[int, float] = {}
+        self._stats = {"connects": 0, "closes": 0, "invalidations": 0}
+
+    def observe_wait(self, elapsed_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+                return
+            self._wait_counts[bisect.bisect_left(WAIT_BUCKETS_MS, elapsed_ms)] += 1
+            self._wait_total_ms += elapsed_ms
+            self._wait_max_ms = max(self._wait_max_ms, elapsed_ms)
+
+    def attach(self, engine: Engine) -> None:
+        """
+        エンジンのプールイベントに計測用のリスナーを登録する
+        """
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self._connected_at[id(dbapi_connection)] = time.monotonic()
+                self._stats["connects"] += 1
+
+        @event.listens_for(engine, "close")
+        def _on_close(dbapi_connection, connection_record):
+            self._forget(dbapi_connection)
+
+        @event.listens_for(engine, "close_detached")
+        def _on_close_detached(dbapi_connection):
+            self._forget(dbapi_connection)
+
+        @event.listens_for(engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self._stats["invalidations"] += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        プールの現在の状態と計測値をまとめて返す
+        """
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - connected_at for connected_at in self._connected_at.values()]
+            observed = sum(self._wait_counts)
+            histogram = {
+                f"le_{bound}ms": count for bound, count in zip(WAIT_BUCKETS_MS, self._wait_counts)
+            }
+            histogram["gt_%dms" % WAIT_BUCKETS_MS[-1]] = self._wait_counts[-1]
+            metrics = {
+                **self._stats,
+                "wait": {
+                    "count": observed,
+                    "avg_ms": round(self._wait_total_ms / observed, 3) if observed else None,
+                    "max_ms": round(self._wait_max_ms, 3),
+                    "timeouts": self._timeouts,
+                    "histogram": histogram,
+                },
+                "connection_age_seconds": {
+                    "open": len(ages),
+                    "min": round(min(ages), 1) if ages else None,
+                    "max": round(max(ages), 1) if ages else None,
+                    "avg": round(sum(ages) / len(ages), 1) if ages else None,
+                },
+            }
+        if isinstance(pool, QueuePool):
+            metrics.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                # overflow() はプールが埋まるまで負の値になるため0で下限を取る
+                overflow=max(pool.overflow(), 0),
+            )
+        return {"name": self.name, **metrics}
+
+    def _forget(self, dbapi_connection) -> None:
+        with self._lock:
+            if self._connected_at.pop(id(dbapi_connection), None) is not None:
+                self._stats["closes"] += 1
+
+
+class _InstrumentedPoolMixin:
+    """
+    プールからの接続取得にかかった時間を計測する
+    （プールの再作成時もクラスごと引き継がれるよう、計測先はクラス属性に持たせる）
+    """
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_wait(0, timed_out=True)
+            raise
+        self.metrics.observe_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+
+def instrumented_pool_class(base: Type[QueuePool], metrics: PoolMetrics) -> Type[QueuePool]:
+    """
+    接続の待ち時間を metrics に記録する QueuePool（または AsyncAdaptedQueuePool）のサブクラスを作成する
+    """
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPoolMixin, base), {"metrics": metrics})
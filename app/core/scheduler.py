@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import Callable, List
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 起動中の定期ジョブ
+_tasks: List[asyncio.Task] = []
+
+
+def run_with_session(job: Callable[[Session], object]) -> None:
+    """
+    専用のデータベースセッションでジョブを1回実行する
+    """
+    db = SessionLocal()
+    try:
+        job(db)
+    finally:
+        db.close()
+
+
+async def _run_periodically(name: str, interval_seconds: int, job: Callable[[Session], object], run_immediately: bool) -> None:
+    if not run_immediately:
+        await asyncio.sleep(interval_seconds)
+
+    while True:
+        try:
+            # 同期DBアクセスはイベントループを塞がないようスレッドプールで実行
+            await run_in_threadpool(run_with_session, job)
+        except Exception:
+            logger.exception("定期ジョブ %s の実行に失敗しました", name)
+        await asyncio.sleep(interval_seconds)
+
+
+def start_periodic_job(
+    name: str,
+    interval_seconds: int,
+    job: Callable[[Session], object],
+    run_immediately: bool = False
+) -> None:
+    """
+    データベースセッションを受け取るジョブを一定間隔で実行する
+    アプリケーションの startup イベントから呼び出す
+
+    :param name: ログ出力用のジョブ名
+    :param interval_seconds: 実行間隔（秒）。0以下の場合は登録しない
+    :param job: セッションを受け取る同期関数
+    :param run_immediately: Trueの場合は起動直後に1回実行する
+    """
+    if interval_seconds <= 0:
+        return
+    _tasks.append(asyncio.create_task(_run_periodically(name, interval_seconds, job, run_immediately)))
+
+
+async def stop_periodic_jobs() -> None:
+    """
+    起動中の定期ジョブをすべて停止する
+    """
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -16,7 +18,20 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 
 # パスワードハッシュ用のコンテキスト
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# コストを上限・下限にも設定し、設定と異なるコストのハッシュを needs_update で検出する
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# ハッシュ計算専用のスレッドプール（bcryptはGILを解放するため、同時実行数をCPU数程度に制限する）
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
 
 def verify_password(plain_password: str, stored_password: str) -> bool:
     """
@@ -42,6 +57,37 @@ def get_password_hash(password: str) -> str:
     else:
         return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, stored_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    パスワードを検証し、保存済みのハッシュが現在のコスト設定と異なる場合は新しいハッシュも返す
+    
+    :return: (検証結果, 再ハッシュ後の値（不要な場合はNone）)
+    """
+    # 開発環境では単純な文字列比較
+    if settings.DEBUG:
+        return plain_password == stored_password, None
+    return pwd_context.verify_and_update(plain_password, stored_password)
+
+async def verify_and_update_password_async(plain_password: str, stored_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    verify_and_update_password をハッシュ計算専用のスレッドプールで実行する
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_and_update_password, plain_password, stored_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    get_password_hash をハッシュ計算専用のスレッドプールで実行する
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+def hash_password_in_pool(password: str) -> str:
+    """
+    同期エンドポイントから、ハッシュ計算専用のスレッドプールでハッシュ化する（同時計算数を制限するため）
+    """
+    return _password_executor.submit(get_password_hash, password).result()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     
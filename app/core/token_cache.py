@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+class UserSnapshot:
+    """
+    認証済みユーザーの最小限の情報（user_id と name のみを使うエンドポイント向け）
+    """
+
+    __slots__ = ("user_id", "name")
+
+    def __init__(self, user_id: int, name: str):
+        self.user_id = user_id
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"UserSnapshot(user_id={self.user_id!r}, name={self.name!r})"
+
+
+class TokenCache:
+    """
+    検証済みアクセストークン → ユーザースナップショットのキャッシュ
+    - 上限を超えた場合は最も使われていないトークンから破棄する（LRU）
+    - 有効期間は TTL とトークン自体の有効期限の短い方
+    - ユーザー情報の変更時は invalidate_user() でそのユーザーのトークンをすべて破棄する
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, UserSnapshot]]" = OrderedDict()
+        # ユーザーID → キャッシュ中のトークン（ユーザー単位の無効化用）
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[0] <= time.time():
+                self._remove_locked(token)
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(token)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, token: str, snapshot: UserSnapshot, token_expires_at: Optional[float] = None) -> None:
+        """
+        :param token_expires_at: トークンの有効期限（UNIX時刻、JWTの exp）
+        """
+        expires_at = time.time() + self._ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            self._remove_locked(token)
+            self._entries[token] = (expires_at, snapshot)
+            self._tokens_by_user.setdefault(snapshot.user_id, set()).add(token)
+            while len(self._entries) > self._max_entries:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        ユーザー情報の変更時に、そのユーザーのキャッシュをすべて破棄する
+        """
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove_locked(token)
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else None,
+            }
+
+    def _remove_locked(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[1].user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[1].user_id]
+
+
+# アプリケーション全体で共有するトークンキャッシュ
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES, settings.TOKEN_CACHE_TTL_SECONDS)
@@ -17,6 +17,18 @@ from app.api.auth.router import login_for_access_token
 # 設定のインスタンスを作成
 settings = Settings()
 
+# バックグラウンドジョブ
+from app.core.scheduler import start_periodic_job, stop_periodic_jobs
+from app.core.database import async_engine, engine
+from app.services.project_counters import reconcile_project_counters, reconcile_trouble_counters
+from app.services.leaderboard import rebuild_leaderboard
+from app.services.search_index import rebuild_project_search_index
+from app.services.helper_matcher import rebuild_helper_matcher
+from app.services.pubsub import hub
+from app.services.message_ingest import message_ingestor
+from app.services.login_throttle import login_throttle
+from starlette.concurrency import run_in_threadpool
+
 # APIルーターのインポート
 from app.api.troubles.router import router as troubles_router
 from app.api.projects.router import router as projects_router
@@ -24,6 +36,8 @@ from app.api.users.router import router as users_router
 from app.api.messages.router import router as messages_router
 from app.api.auth.router import router as auth_router
 from app.api.troubles.categories import router as trouble_categories_router
+from app.api.projects.categories import router as project_categories_router
+from app.api.admin.router import router as admin_router
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -48,10 +62,62 @@ app.include_router(messages_router, prefix=f"{settings.API_V1_STR}/messages", ta
 app.include_router(auth_router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 # 追加: トラブルカテゴリールーターを追加
 app.include_router(trouble_categories_router, prefix=f"{settings.API_V1_STR}/trouble-categories", tags=["trouble-categories"])
+app.include_router(project_categories_router, prefix=f"{settings.API_V1_STR}/project-categories", tags=["project-categories"])
+app.include_router(admin_router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
 
 # ルートレベルに /token エンドポイントを追加
 app.post("/token", response_model=Token)(login_for_access_token)
 
+@app.on_event("startup")
+async def start_background_jobs():
+    # メッセージのリアルタイム配信ハブ
+    await hub.start()
+    # メッセージ受付キューの書き込みワーカー
+    message_ingestor.start()
+    # いいね数・コメント数カウンターのずれを定期的に修復
+    start_periodic_job(
+        "reconcile_project_counters",
+        settings.PROJECT_COUNTER_RECONCILE_INTERVAL_SECONDS,
+        reconcile_project_counters
+    )
+    start_periodic_job(
+        "reconcile_trouble_counters",
+        settings.PROJECT_COUNTER_RECONCILE_INTERVAL_SECONDS,
+        reconcile_trouble_counters
+    )
+    # ランキングを起動時に構築し、以降は定期的に再構築してずれを解消
+    start_periodic_job(
+        "rebuild_leaderboard",
+        settings.LEADERBOARD_REBUILD_INTERVAL_SECONDS,
+        rebuild_leaderboard,
+        run_immediately=True
+    )
+    # 検索インデックスも同様に起動時に構築し、他ワーカーでの変更を定期的に取り込む
+    start_periodic_job(
+        "rebuild_project_search_index",
+        settings.SEARCH_INDEX_REBUILD_INTERVAL_SECONDS,
+        rebuild_project_search_index,
+        run_immediately=True
+    )
+    # お困りごとの回答候補者インデックス（カテゴリー → ポイント順のユーザー）
+    start_periodic_job(
+        "rebuild_helper_matcher",
+        settings.HELPER_MATCHER_REBUILD_INTERVAL_SECONDS,
+        rebuild_helper_matcher,
+        run_immediately=True
+    )
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    await stop_periodic_jobs()
+    # 受付済みのメッセージを保存しきってから配信ハブを止める
+    await run_in_threadpool(message_ingestor.stop)
+    await hub.stop()
+    await login_throttle.stop()
+    # プールの接続を閉じる（aiosqlite は接続ごとのスレッドが残るとプロセスが終了しない）
+    await async_engine.dispose()
+    engine.dispose()
+
 @app.get("/")
 def read_root():
     return {"message": f"Welcome to {settings.PROJECT_NAME}"}
@@ -0,0 +1,77 @@
+"""
+複数ワーカー間でPub/Subを共有するためのローカルブローカー
+
+    python -m app.services.broker --host 127.0.0.1 --port 8765
+
+各ワーカーは PUBSUB_BACKEND=broker で起動すると、このブローカーに接続する
+受け取った publish を、subscribe を送ってきた全ワーカーへそのまま転送する（1行1件のJSON）
+LOGIN_THROTTLE_BACKEND=broker の場合は、ログイン試行制限のトークンバケットもここで保持し、
+throttle の要求には送信元のワーカーにだけ結果を返す
+"""
+import argparse
+import asyncio
+import json
+import logging
+from typing import Set
+
+from app.services.login_throttle import TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    def __init__(self, throttle_max_keys: int = 100000):
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._limiter = TokenBucketLimiter(throttle_max_keys)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # 配信先には subscribe / publish を送ってきた接続のみを加える
+        # （throttle 専用の接続に配信が混ざると、応答の代わりに配信を読んでしまうため）
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                event = json.loads(line)
+                op = event.get("op")
+                if op == "throttle":
+                    retry_after = self._limiter.acquire([tuple(limit) for limit in event["limits"]])
+                    writer.write(json.dumps({"retry_after": retry_after}).encode("utf-8") + b"\n")
+                    await writer.drain()
+                elif op == "subscribe":
+                    self._clients.add(writer)
+                elif op == "publish":
+                    self._clients.add(writer)
+                    await self._broadcast(line)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, KeyError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _broadcast(self, line: bytes) -> None:
+        for client in list(self._clients):
+            try:
+                client.write(line)
+                await client.drain()
+            except ConnectionError:
+                self._clients.discard(client)
+
+
+async def serve(host: str, port: int, throttle_max_keys: int = 100000) -> None:
+    broker = Broker(throttle_max_keys)
+    server = await asyncio.start_server(broker.handle, host, port)
+    logger.info("ブローカーを起動しました: %s:%d", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="コラボゲームズ用ローカルブローカー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--throttle-max-keys", type=int, default=100000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(args.host, args.port, args.throttle_max_keys))
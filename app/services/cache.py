@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class CacheBackend:
+    """
+    キャッシュの保存先インターフェース
+    複数ワーカーで共有したい場合は、外部ストアを使う実装に差し替える
+    """
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    プロセス内の辞書に保存するキャッシュ
+    上限を超えた場合は期限切れのエントリ、次に最も古く登録されたエントリから削除する
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._max_entries = max_entries
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            return True, value
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                self._evict()
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) >= self._max_entries:
+            # 辞書は挿入順を保持するため、先頭が最も古いエントリ
+            del self._entries[next(iter(self._entries))]
+
+
+class ResultCache:
+    """
+    TTL付きの結果キャッシュ
+    キーは "名前空間:..." の形式とし、名前空間ごとにヒット率を集計する
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, default_ttl_seconds: float = 60):
+        self.backend = backend or InMemoryCacheBackend()
+        self.default_ttl_seconds = default_ttl_seconds
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "invalidations": 0}
+        )
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl_seconds: Optional[float] = None) -> Any:
+        """
+        キャッシュがあればその値を返し、なければ loader の結果を保存して返す
+        """
+        found, value = self.backend.get(key)
+        self._count(key, "hits" if found else "misses")
+        if found:
+            return value
+
+        value = loader()
+        self.backend.set(key, value, ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        self.backend.delete(key)
+        self._count(key, "invalidations")
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        self.backend.delete_prefix(prefix)
+        self._count(prefix, "invalidations")
+
+    def set_backend(self, backend: CacheBackend) -> None:
+        """
+        保存先を差し替える（統計はリセットしない）
+        """
+        self.backend = backend
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        名前空間ごとのヒット・ミス・無効化回数とヒット率を返す
+        """
+        with self._lock:
+            namespaces = {}
+            for namespace, counts in self._stats.items():
+                lookups = counts["hits"] + counts["misses"]
+                namespaces[namespace] = {
+                    **counts,
+                    "hit_rate": round(counts["hits"] / lookups, 4) if lookups else None,
+                }
+        return {"entries": self.backend.size(), "namespaces": namespaces}
+
+    def _count(self, key: str, field: str) -> None:
+        namespace = key.split(":", 1)[0]
+        with self._lock:
+            self._stats[namespace][field] += 1
+
+
+# アプリケーション全体で共有する結果キャッシュ
+result_cache = ResultCache()
@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.api.projects.models import ProjectCategory
+from app.api.troubles.models import TroubleCategory
+
+
+class CategorySnapshot:
+    """
+    ある時点のカテゴリー一覧（読み取り専用）
+    """
+
+    def __init__(self, items: Tuple[Tuple[int, str], ...], version: int):
+        self.items = items
+        self.names: Dict[int, str] = dict(items)
+        self.version = version
+        # 内容から作るため、ワーカー間でも同じカテゴリー一覧なら同じETagになる
+        self.etag = make_etag(*(f"{category_id}:{name}" for category_id, name in items))
+
+    def get_name(self, category_id: Optional[int]) -> Optional[str]:
+        if category_id is None:
+            return None
+        return self.names.get(category_id)
+
+
+class CategoryCatalog:
+    """
+    カテゴリーテーブルをメモリに保持するカタログ
+    - カテゴリーの作成・更新・削除時に invalidate() でバージョンを進め、次回参照時に読み直す
+    - 他ワーカーでの変更は CATEGORY_CATALOG_TTL_SECONDS 経過後の読み直しで取り込む
+    """
+
+    def __init__(self, model):
+        self._model = model
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CategorySnapshot] = None
+        self._loaded_at = 0.0
+        self.version = 0
+
+    def snapshot(self, db: Session) -> CategorySnapshot:
+        """
+        現在のカテゴリー一覧を取得する（必要な場合のみDBから読み込む）
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version and not self._expired():
+            return snapshot
+
+        # 問い合わせ中はロックを持たない（読み込み中に他のリクエストを待たせないため）
+        version = self.version
+        rows = db.query(self._model.category_id, self._model.name).order_by(self._model.category_id).all()
+        snapshot = CategorySnapshot(tuple((row.category_id, row.name) for row in rows), version)
+
+        with self._lock:
+            # 読み込み中に invalidate された場合は古い内容を保持しない
+            if version == self.version:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+        return snapshot
+
+    def contains(self, db: Session, category_id: int) -> bool:
+        """
+        カテゴリーが存在するか判定する
+        カタログにない場合は他ワーカーで作成された可能性があるため、一度だけ読み直して確認する
+        """
+        if self.snapshot(db).get_name(category_id) is not None:
+            return True
+        self.invalidate()
+        return self.snapshot(db).get_name(category_id) is not None
+
+    def invalidate(self) -> None:
+        """
+        カテゴリーの変更を通知し、バージョンを進める
+        """
+        with self._lock:
+            self.version += 1
+            self._snapshot = None
+
+    def _expired(self) -> bool:
+        return time.monotonic() - self._loaded_at > settings.CATEGORY_CATALOG_TTL_SECONDS
+
+
+# プロジェクト・お困りごとのカテゴリーカタログ
+project_category_catalog = CategoryCatalog(ProjectCategory)
+trouble_category_catalog = CategoryCatalog(TroubleCategory)
@@ -0,0 +1,110 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Iterable, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.api.projects.models import UserProjectFavorite
+
+
+class FavoriteStore:
+    """
+    ユーザーごとのお気に入りプロジェクトIDをメモリに保持する
+    - 初回参照時にDBから読み込み、ソート済みの整数配列として保持する
+    - お気に入りの登録・解除時は add() / remove() で差分反映する
+    - 保持するユーザー数は上限を超えると最も使われていないユーザーから破棄する
+    - 他ワーカーでの変更は FAVORITE_STORE_TTL_SECONDS 経過後の読み直しで取り込む
+    """
+
+    def __init__(self, max_users: int = 10000):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[float, array]]" = OrderedDict()
+        self._max_users = max_users
+        # 書き込みの通し番号（読み込み中に書き込みがあったかの判定用）
+        self._generation = 0
+
+    def project_ids(self, db: Session, user_id: int) -> array:
+        """
+        ユーザーのお気に入りプロジェクトIDをソート済み配列で取得する
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+            generation = self._generation
+
+        rows = db.query(UserProjectFavorite.project_id).filter(
+            UserProjectFavorite.user_id == user_id
+        ).all()
+        project_ids = array("q", sorted(row.project_id for row in rows))
+
+        with self._lock:
+            # 読み込み中に書き込みがあった場合は次回の参照で読み直す
+            expires_at = now + settings.FAVORITE_STORE_TTL_SECONDS if generation == self._generation else now
+            self._entries[user_id] = (expires_at, project_ids)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._max_users:
+                self._entries.popitem(last=False)
+        return project_ids
+
+    def is_favorite(self, db: Session, user_id: int, project_id: int) -> bool:
+        return _contains(self.project_ids(db, user_id), project_id)
+
+    def favorite_ids_among(self, db: Session, user_id: int, project_ids: Iterable[int]) -> Set[int]:
+        """
+        指定したプロジェクトのうち、お気に入り登録されているIDの集合を返す
+        """
+        favorites = self.project_ids(db, user_id)
+        return {project_id for project_id in project_ids if _contains(favorites, project_id)}
+
+    def add(self, user_id: int, project_id: int) -> None:
+        """
+        お気に入り登録を反映する（コミット後に呼び出す）
+        """
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return
+            project_ids = entry[1]
+            index = bisect_left(project_ids, project_id)
+            if index == len(project_ids) or project_ids[index] != project_id:
+                # 参照中の配列を書き換えないよう、新しい配列に差し替える
+                updated = project_ids[:index]
+                updated.append(project_id)
+                updated.extend(project_ids[index:])
+                self._entries[user_id] = (entry[0], updated)
+
+    def remove(self, user_id: int, project_id: int) -> None:
+        """
+        お気に入り解除を反映する（コミット後に呼び出す）
+        """
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return
+            project_ids = entry[1]
+            index = bisect_left(project_ids, project_id)
+            if index < len(project_ids) and project_ids[index] == project_id:
+                self._entries[user_id] = (entry[0], project_ids[:index] + project_ids[index + 1:])
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+
+def _contains(sorted_ids: array, project_id: int) -> bool:
+    index = bisect_left(sorted_ids, project_id)
+    return index < len(sorted_ids) and sorted_ids[index] == project_id
+
+
+# アプリケーション全体で共有するお気に入りストア
+favorite_store = FavoriteStore()
@@ -0,0 +1,160 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.api.users.models import User
+from app.api.troubles.schemas import HelperCandidate
+
+
+# お困りごとのカテゴリー（TroubleCategory）→ 回答できそうなユーザーのカテゴリー（GET /users/categories の部署・分野）
+# ユーザーのカテゴリーとお困りごとのカテゴリーは別の語彙のため、この対応表で候補者を探す
+# （対応表にないカテゴリーは、同じ名前をユーザーのカテゴリーに登録しているユーザーのみが候補となる）
+TROUBLE_TO_USER_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "UI/UXデザイン": ("デザイン部", "アート"),
+    "コンテンツ制作": ("アート", "音楽", "デザイン部"),
+    "モバイル開発": ("システム部",),
+    "技術相談": ("システム部", "情セキ部"),
+    "マーケティング": ("事業企画部", "営業部"),
+}
+
+
+def related_user_categories(trouble_category: str) -> Tuple[str, ...]:
+    """
+    お困りごとのカテゴリーに対応するユーザーのカテゴリー（同名のカテゴリーを含む）
+    """
+    name = trouble_category.strip()
+    return tuple(dict.fromkeys((name,) + TROUBLE_TO_USER_CATEGORIES.get(name, ())))
+
+
+def _split_categories(categories: Optional[str]) -> Tuple[str, ...]:
+    # User.get_categories_list と同じ規則で分割する（空要素は除く）
+    if not categories:
+        return ()
+    return tuple(dict.fromkeys(cat.strip() for cat in categories.split(",") if cat.strip()))
+
+
+class HelperMatcher:
+    """
+    お困りごとの回答候補者を探すための、カテゴリー → ユーザーの転置インデックス
+    - カテゴリーごとに (-ポイント, ユーザーID) のソート済み配列を持ち、先頭ほどポイントが高い
+    - 上位N件は配列の先頭から読むだけのため、リクエスト毎のDB検索は不要
+    - 名前・ポイント・カテゴリーの変更は update_user() で差分反映する
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        # ユーザーID → (ポイント, 名前, カテゴリー)
+        self._users: Dict[int, Tuple[int, str, Tuple[str, ...]]] = {}
+        self.loaded = False
+
+    def rebuild(self, db: Session) -> None:
+        """
+        データベースの全ユーザーからインデックスを作り直す
+        """
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        users: Dict[int, Tuple[int, str, Tuple[str, ...]]] = {}
+
+        rows = db.query(User.user_id, User.name, User.point_total, User.categories).filter(
+            User.categories.isnot(None),
+            User.categories != ""
+        )
+        for row in rows:
+            categories = _split_categories(row.categories)
+            if not categories:
+                continue
+            points = row.point_total or 0
+            users[row.user_id] = (points, row.name, categories)
+            for category in categories:
+                postings.setdefault(category, []).append((-points, row.user_id))
+        for keys in postings.values():
+            keys.sort()
+
+        with self._lock:
+            self._postings = postings
+            self._users = users
+            self.loaded = True
+
+    def ensure_loaded(self, db: Session) -> None:
+        """
+        未構築の場合のみインデックスを構築する
+        """
+        if not self.loaded:
+            self.rebuild(db)
+
+    def update_user(self, user_id: int, name: str, points: int, categories: Optional[str]) -> None:
+        """
+        ユーザーの名前・ポイント・カテゴリーの変更を反映する
+        """
+        with self._lock:
+            self._update_locked(user_id, name, points or 0, _split_categories(categories))
+
+    def remove_user(self, user_id: int) -> None:
+        with self._lock:
+            self._remove_locked(user_id)
+
+    def candidates(self, category: str, limit: int, exclude_user_ids: Iterable[int] = ()) -> List[HelperCandidate]:
+        """
+        お困りごとのカテゴリーに対応するカテゴリーのユーザーを、ポイントの高い順に取得する
+        （対応する複数のカテゴリーの配列をポイント順のままマージする）
+
+        :param category: お困りごとのカテゴリー名
+        :param limit: 取得件数
+        :param exclude_user_ids: 候補から除くユーザー（お困りごとの作成者など）
+        """
+        # 複数のカテゴリーに登録しているユーザーは1回だけ返す
+        seen = set(exclude_user_ids)
+        result = []
+        with self._lock:
+            postings = [self._postings.get(name, ()) for name in related_user_categories(category)]
+            for negative_points, user_id in heapq.merge(*postings):
+                if user_id in seen:
+                    continue
+                seen.add(user_id)
+                _, name, categories = self._users[user_id]
+                result.append(HelperCandidate(
+                    user_id=user_id,
+                    name=name,
+                    points=-negative_points,
+                    categories=list(categories)
+                ))
+                if len(result) >= limit:
+                    break
+        return result
+
+    def _update_locked(self, user_id: int, name: str, points: int, categories: Tuple[str, ...]) -> None:
+        self._remove_locked(user_id)
+        if not categories:
+            return
+        self._users[user_id] = (points, name, categories)
+        for category in categories:
+            insort(self._postings.setdefault(category, []), (-points, user_id))
+
+    def _remove_locked(self, user_id: int) -> None:
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return
+        key = (-entry[0], user_id)
+        for category in entry[2]:
+            keys = self._postings.get(category)
+            if keys is None:
+                continue
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                del keys[index]
+            if not keys:
+                del self._postings[category]
+
+
+# アプリケーション全体で共有する回答候補者インデックス
+helper_matcher = HelperMatcher()
+
+
+def rebuild_helper_matcher(db: Session) -> None:
+    """
+    定期ジョブ用のインデックス再構築関数（他ワーカーでの変更も取り込む）
+    """
+    helper_matcher.rebuild(db)
@@ -0,0 +1,114 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.api.users.models import User
+from app.api.projects.schemas import RankingUser
+
+
+class Leaderboard:
+    """
+    ポイント順のランキングをメモリ上のソート済み配列で保持する
+    - キーは (-ポイント, ユーザーID) で、配列の先頭ほど上位
+    - 上位K件・自分の順位は二分探索で求めるため、リクエスト毎の ORDER BY は不要
+    - ポイントや名前の変更は update() で差分反映する
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[int, int]] = []
+        self._entries: Dict[int, Tuple[int, str]] = {}
+        self.loaded = False
+
+    def rebuild(self, db: Session) -> None:
+        """
+        データベースから全ユーザーのポイントを読み込み、ランキングを作り直す
+        """
+        rows = db.query(User.user_id, User.name, User.point_total).all()
+        entries = {row.user_id: (row.point_total or 0, row.name) for row in rows}
+        keys = sorted((-points, user_id) for user_id, (points, _) in entries.items())
+
+        with self._lock:
+            self._entries = entries
+            self._keys = keys
+            self.loaded = True
+
+    def ensure_loaded(self, db: Session) -> None:
+        """
+        未構築の場合のみランキングを構築する
+        """
+        if not self.loaded:
+            self.rebuild(db)
+
+    def update(self, user_id: int, name: str, points: int) -> None:
+        """
+        ユーザーのポイント・名前の変更をランキングに反映する
+        """
+        points = points or 0
+        with self._lock:
+            current = self._entries.get(user_id)
+            if current is not None:
+                if current[0] == points:
+                    self._entries[user_id] = (points, name)
+                    return
+                self._remove_key(current[0], user_id)
+            self._entries[user_id] = (points, name)
+            insort(self._keys, (-points, user_id))
+
+    def remove(self, user_id: int) -> None:
+        """
+        ユーザーをランキングから取り除く
+        """
+        with self._lock:
+            current = self._entries.pop(user_id, None)
+            if current is not None:
+                self._remove_key(current[0], user_id)
+
+    def top(self, limit: int) -> List[RankingUser]:
+        """
+        上位のユーザーを取得する（同点は同順位）
+        """
+        with self._lock:
+            result = []
+            rank = 0
+            previous_points = None
+            for index, (negative_points, user_id) in enumerate(self._keys[:limit]):
+                points = -negative_points
+                if points != previous_points:
+                    rank = index + 1
+                    previous_points = points
+                result.append(RankingUser(name=self._entries[user_id][1], points=points, rank=rank))
+            return result
+
+    def rank_of(self, user_id: int) -> Optional[RankingUser]:
+        """
+        指定したユーザーの順位を取得する（ランキングに存在しない場合はNone）
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            points, name = entry
+            # 自分より多いポイントを持つユーザー数 + 1 が順位
+            rank = bisect_left(self._keys, (-points,)) + 1
+            return RankingUser(name=name, points=points, rank=rank)
+
+    def _remove_key(self, points: int, user_id: int) -> None:
+        key = (-points, user_id)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+
+# アプリケーション全体で共有するランキング
+leaderboard = Leaderboard()
+
+
+def rebuild_leaderboard(db: Session) -> None:
+    """
+    定期ジョブ用のランキング再構築関数
+    """
+    leaderboard.rebuild(db)
+
@@ -0,0 +1,120 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.api.troubles.models import Trouble
+from app.api.messages.models import Message
+from app.services.cache import result_cache
+
+# 正確な件数（書き込み時に無効化する）と概算件数（無効化せずTTLで更新する）のキャッシュキー
+TROUBLE_COUNT_PREFIX = "counts:troubles:"
+MESSAGE_COUNT_PREFIX = "counts:messages:"
+APPROXIMATE_COUNT_PREFIX = "counts-approx:"
+
+
+def _filter_key(*values) -> str:
+    """絞り込み条件を正規化したキー（未指定は * とする）"""
+    return ":".join("*" if value in (None, "") else str(value).strip() for value in values)
+
+
+def estimate_table_rows(db: Session, table_name: str) -> Optional[int]:
+    """
+    テーブル統計からおおよその行数を取得する（MySQL以外、または取得できない場合はNone）
+    """
+    if db.get_bind().dialect.name != "mysql":
+        return None
+    return db.execute(
+        text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        ),
+        {"table_name": table_name}
+    ).scalar()
+
+
+def count_troubles(
+    db: Session,
+    project_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    status: Optional[str] = None,
+    approximate: bool = False
+) -> Tuple[int, bool]:
+    """
+    絞り込み条件ごとのお困りごと件数を取得する
+
+    :param approximate: Trueの場合はキャッシュ済みの値またはテーブル統計による概算を許容する
+    :return: (件数, 概算かどうか)
+    """
+    filter_key = _filter_key(project_id, category_id, status)
+
+    def load() -> int:
+        query = db.query(func.count(Trouble.trouble_id))
+        if project_id:
+            query = query.filter(Trouble.project_id == project_id)
+        if category_id:
+            query = query.filter(Trouble.category_id == category_id)
+        if status:
+            query = query.filter(Trouble.status == status)
+        return query.scalar()
+
+    if approximate:
+        unfiltered = not (project_id or category_id or status)
+
+        def load_approximate() -> Tuple[int, bool]:
+            estimated = estimate_table_rows(db, Trouble.__tablename__) if unfiltered else None
+            if estimated is not None:
+                return estimated, True
+            # 条件付きの場合は正確な件数を長めのTTLで使い回す
+            return load(), True
+
+        return result_cache.get_or_set(
+            f"{APPROXIMATE_COUNT_PREFIX}troubles:{filter_key}",
+            load_approximate,
+            settings.LIST_COUNT_APPROXIMATE_TTL_SECONDS
+        )
+
+    total = result_cache.get_or_set(
+        TROUBLE_COUNT_PREFIX + filter_key, load, settings.LIST_COUNT_CACHE_TTL_SECONDS
+    )
+    return total, False
+
+
+def count_messages(db: Session, trouble_id: int, approximate: bool = False) -> Tuple[int, bool]:
+    """
+    お困りごとごとのメッセージ件数を取得する
+
+    :param approximate: Trueの場合は長めのTTLでキャッシュした値を許容する
+    :return: (件数, 概算かどうか)
+    """
+    def load() -> int:
+        return db.query(func.count(Message.id)).filter(Message.trouble_id == trouble_id).scalar()
+
+    if approximate:
+        total = result_cache.get_or_set(
+            f"{APPROXIMATE_COUNT_PREFIX}messages:{trouble_id}",
+            load,
+            settings.LIST_COUNT_APPROXIMATE_TTL_SECONDS
+        )
+        return total, True
+
+    total = result_cache.get_or_set(
+        f"{MESSAGE_COUNT_PREFIX}{trouble_id}", load, settings.LIST_COUNT_CACHE_TTL_SECONDS
+    )
+    return total, False
+
+
+def invalidate_trouble_counts() -> None:
+    """
+    お困りごとの作成・更新・削除時に呼び出す
+    どの絞り込み条件の件数が変わるかは判定せず、すべて無効化する
+    """
+    result_cache.invalidate_prefix(TROUBLE_COUNT_PREFIX)
+
+
+def invalidate_message_counts(trouble_id: int) -> None:
+    """
+    メッセージの作成・更新・削除時に呼び出す
+    """
+    result_cache.invalidate(f"{MESSAGE_COUNT_PREFIX}{trouble_id}")
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (キー, バケット容量, 1秒あたりの補充数)
+Limit = Tuple[str, float, float]
+
+
+class TokenBucketLimiter:
+    """
+    キーごとのトークンバケット
+    - バケットは (残りトークン, 最終更新時刻) のタプルのみで保持する
+    - 満タンまで回復したバケットは存在しないのと同じなので、定期的に掃除して捨てる
+    - 上限件数を超えた場合は最も長く触られていないキーから捨てる
+    """
+
+    def __init__(self, max_keys: int = 100000, sweep_interval_seconds: float = 60):
+        self._lock = threading.Lock()
+        # キー → (残りトークン, 最終更新時刻, 容量, 補充速度)。挿入順 = 最終更新順
+        self._buckets: Dict[str, Tuple[float, float, float, float]] = {}
+        self._max_keys = max_keys
+        self._sweep_interval_seconds = sweep_interval_seconds
+        self._last_sweep = time.monotonic()
+        self._stats = {"allowed": 0, "rejected": 0, "evictions": 0}
+
+    def acquire(self, limits: Sequence[Limit], now: Optional[float] = None) -> float:
+        """
+        すべてのキーから1トークンずつ消費する
+        どれか1つでも足りない場合はどのキーからも消費せず、再試行までの秒数を返す
+
+        :return: 許可された場合は0、拒否された場合は再試行までの秒数
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            refilled = []
+            retry_after = 0.0
+            for key, capacity, rate in limits:
+                tokens = self._tokens_locked(key, capacity, rate, now)
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) / rate)
+                refilled.append((key, tokens, capacity, rate))
+
+            if retry_after > 0:
+                self._stats["rejected"] += 1
+            else:
+                self._stats["allowed"] += 1
+            for key, tokens, capacity, rate in refilled:
+                if retry_after <= 0:
+                    tokens -= 1
+                # 最終更新順を保つため入れ直す
+                self._buckets.pop(key, None)
+                self._buckets[key] = (tokens, now, capacity, rate)
+
+            if now - self._last_sweep >= self._sweep_interval_seconds:
+                self._sweep_locked(now)
+            while len(self._buckets) > self._max_keys:
+                del self._buckets[next(iter(self._buckets))]
+                self._stats["evictions"] += 1
+            return retry_after
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "keys": len(self._buckets)}
+
+    def _tokens_locked(self, key: str, capacity: float, rate: float, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return capacity
+        tokens, updated_at = bucket[0], bucket[1]
+        return min(capacity, tokens + (now - updated_at) * rate)
+
+    def _sweep_locked(self, now: float) -> None:
+        full = [
+            key for key, (tokens, updated_at, capacity, rate) in self._buckets.items()
+            if tokens + (now - updated_at) * rate >= capacity
+        ]
+        for key in full:
+            del self._buckets[key]
+        self._last_sweep = now
+
+
+class ThrottleBackend:
+    """
+    トークンバケットの保持先のインターフェース
+    """
+
+    async def acquire(self, limits: Sequence[Limit]) -> float:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    async def stop(self) -> None:
+        pass
+
+
+class LocalThrottleBackend(ThrottleBackend):
+    """
+    ワーカーごとのメモリ上で制限する（ワーカー1つの場合の既定）
+    """
+
+    def __init__(self, limiter: Optional[TokenBucketLimiter] = None):
+        self.limiter = limiter or TokenBucketLimiter(settings.LOGIN_THROTTLE_MAX_KEYS)
+
+    async def acquire(self, limits: Sequence[Limit]) -> float:
+        return self.limiter.acquire(limits)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.limiter.stats()
+
+
+class BrokerThrottleBackend(ThrottleBackend):
+    """
+    app.services.broker で起動したローカルブローカーにバケットを持たせ、複数ワーカーで1つの制限を共有する
+    ブローカーに接続できない間は、ワーカー内のバケットで制限を続ける
+    """
+
+    def __init__(self, host: str, port: int, timeout_seconds: float = 0.5, fallback: Optional[ThrottleBackend] = None):
+        self.host = host
+        self.port = port
+        self.timeout_seconds = timeout_seconds
+        self.fallback = fallback or LocalThrottleBackend()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, limits: Sequence[Limit]) -> float:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        line = json.dumps({"op": "throttle", "limits": [list(limit) for limit in limits]}, ensure_ascii=False)
+        try:
+            # 1接続で要求と応答を1件ずつ受け渡す
+            async with self._lock:
+                return await asyncio.wait_for(self._request(line), self.timeout_seconds)
+        except (OSError, ValueError, KeyError, asyncio.TimeoutError):
+            logger.warning("ブローカー %s:%d でのログイン試行制限に失敗しました。ワーカー内で制限します", self.host, self.port)
+            self._close()
+            return await self.fallback.acquire(limits)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"connected": self._writer is not None, "fallback": self.fallback.stats()}
+
+    async def stop(self) -> None:
+        self._close()
+
+    async def _request(self, line: str) -> float:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(line.encode("utf-8") + b"\n")
+        await self._writer.drain()
+        response = await self._reader.readline()
+        if not response:
+            raise ConnectionError("ブローカーとの接続が切断されました")
+        return float(json.loads(response)["retry_after"])
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+
+class LoginThrottle:
+    """
+    ログイン試行をユーザー名・接続元IPごとのトークンバケットで制限する
+    DB検索やパスワード検証の前に呼び出し、上限を超えた試行を安く弾く
+    """
+
+    def __init__(self, backend: ThrottleBackend):
+        self.backend = backend
+
+    async def check(self, username: str, client_ip: Optional[str]) -> float:
+        """
+        :return: 許可された場合は0、拒否された場合は再試行までの秒数
+        """
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return 0.0
+        limits: List[Limit] = [(
+            f"user:{username.strip().casefold()}",
+            settings.LOGIN_THROTTLE_USERNAME_BURST,
+            settings.LOGIN_THROTTLE_USERNAME_PER_MINUTE / 60,
+        )]
+        if client_ip:
+            limits.append((
+                f"ip:{client_ip}",
+                settings.LOGIN_THROTTLE_IP_BURST,
+                settings.LOGIN_THROTTLE_IP_PER_MINUTE / 60,
+            ))
+        return await self.backend.acquire(limits)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.backend.stats()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+
+def create_throttle_backend() -> ThrottleBackend:
+    """
+    設定 LOGIN_THROTTLE_BACKEND に応じたバックエンドを作成する（"local" または "broker"）
+    ブローカーの接続先は Pub/Sub と共通（PUBSUB_BROKER_HOST / PUBSUB_BROKER_PORT）
+    """
+    if settings.LOGIN_THROTTLE_BACKEND == "broker":
+        return BrokerThrottleBackend(settings.PUBSUB_BROKER_HOST, settings.PUBSUB_BROKER_PORT)
+    return LocalThrottleBackend()
+
+
+# アプリケーション全体で共有するログイン試行制限
+login_throttle = LoginThrottle(create_throttle_backend())
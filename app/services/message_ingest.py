@@ -0,0 +1,203 @@
+import logging
+import queue
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.api.messages.models import Message
+from app.api.messages.schemas import MessageResponse
+from app.services.project_counters import increment_project_counters, increment_trouble_comments
+from app.services.list_counts import invalidate_message_counts
+from app.services.messages import message_created_event, message_failed_event
+from app.services.pubsub import hub, trouble_channel
+
+logger = logging.getLogger(__name__)
+
+# ワーカー停止の合図
+_STOP = object()
+
+
+class IngestQueueFull(Exception):
+    """
+    受付キューが満杯でメッセージを受け付けられない
+    """
+
+
+class MessageIngestor:
+    """
+    メッセージの書き込みを後回しにする受付キュー（書き込みが集中するスレッド向け）
+    - submit() はキューに積んで受付IDを返すだけで、DBには書き込まない
+    - バックグラウンドのワーカーがまとめて取り出し、複数行INSERTと1回のコミットで保存する
+    - 保存後は受付IDを付けた message.created イベントをスレッドの購読者に配信する
+    - 保存できなかったメッセージは受付IDを付けた message.failed イベントで通知する
+    """
+
+    def __init__(self, max_size: int = 10000, batch_size: int = 500, flush_interval_seconds: float = 0.2):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_size)
+        self._worker: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"accepted": 0, "rejected": 0, "stored": 0, "failed": 0, "batches": 0}
+
+    def start(self) -> None:
+        if self._worker is not None:
+            return
+        self._worker = threading.Thread(target=self._run, name="message-ingest", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """
+        キューに残っているメッセージを保存してからワーカーを止める
+        """
+        if self._worker is None:
+            return
+        self._queue.put(_STOP)
+        self._worker.join()
+        self._worker = None
+
+    def submit(self, trouble_id: int, project_id: Optional[int], user_id: int, user_name: str, content: str) -> str:
+        """
+        メッセージを受付キューに積む
+
+        :return: 受付ID（配信イベントの ack_id と対応する）
+        :raises: キューが満杯の場合は IngestQueueFull
+        """
+        ack_id = uuid.uuid4().hex
+        item = {
+            "ack_id": ack_id,
+            "trouble_id": trouble_id,
+            "project_id": project_id,
+            "user_id": user_id,
+            "user_name": user_name,
+            "content": content,
+        }
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._count("rejected")
+            raise IngestQueueFull()
+        self._count("accepted")
+        return ack_id
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            # 溜まっている分をバッチサイズまでまとめる（少なければ少し待って集める）
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval_seconds)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        バッチを保存する
+        行に起因するエラー（削除済みのお困りごとへの外部キー違反など）の場合は、バッチを二分して保存し直し、
+        失敗した行のみを拒否する（拒否した行は message.failed イベントで通知する）
+        """
+        try:
+            stored = self._store(batch)
+        except (IntegrityError, DataError) as error:
+            if len(batch) == 1:
+                self._reject(batch, "メッセージを保存できませんでした", error)
+                return
+            middle = len(batch) // 2
+            self._flush(batch[:middle])
+            self._flush(batch[middle:])
+            return
+        except Exception as error:
+            # 接続断などバッチ全体に関わるエラーは、分割しても成功しないためまとめて拒否する
+            self._reject(batch, "メッセージの保存に失敗しました", error)
+            return
+
+        self._count("stored", len(batch))
+        self._count("batches")
+        for trouble_id in {item["trouble_id"] for item in batch}:
+            invalidate_message_counts(trouble_id)
+
+        for item in batch:
+            message_id, created_at = stored[item["ack_id"]]
+            message = MessageResponse(
+                id=message_id,
+                content=item["content"],
+                user_id=item["user_id"],
+                user_name=item["user_name"],
+                trouble_id=item["trouble_id"],
+                created_at=created_at
+            )
+            hub.publish_threadsafe(trouble_channel(item["trouble_id"]), message_created_event(message, item["ack_id"]))
+
+    def _store(self, batch: List[Dict[str, Any]]) -> Dict[str, Tuple[int, datetime]]:
+        """
+        複数行INSERTとカウンターの加算を1回のコミットで行う
+        作成日時は同期の投稿と同じくDBの既定値（保存時刻）とし、採番されたIDと合わせて受付IDで読み戻す
+        （MySQLは RETURNING に対応せず、複数行INSERTのIDは連番とは限らないため）
+
+        :return: 受付ID → (メッセージID, 作成日時)
+        """
+        db = SessionLocal()
+        try:
+            db.execute(insert(Message).values([
+                {
+                    "content": item["content"],
+                    "user_id": item["user_id"],
+                    "trouble_id": item["trouble_id"],
+                    "ack_id": item["ack_id"],
+                }
+                for item in batch
+            ]))
+            rows = db.query(Message.ack_id, Message.id, Message.created_at).filter(
+                Message.ack_id.in_([item["ack_id"] for item in batch])
+            ).all()
+            # カウンターはプロジェクト・お困りごとごとにまとめて加算
+            for project_id, comments in Counter(item["project_id"] for item in batch).items():
+                if project_id is not None:
+                    increment_project_counters(db, project_id, comments=comments)
+            for trouble_id, comments in Counter(item["trouble_id"] for item in batch).items():
+                increment_trouble_comments(db, trouble_id, comments=comments)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return {row.ack_id: (row.id, row.created_at) for row in rows}
+
+    def _reject(self, batch: List[Dict[str, Any]], detail: str, error: Exception) -> None:
+        self._count("failed", len(batch))
+        logger.error("メッセージの保存に失敗しました: %d件", len(batch), exc_info=error)
+        for item in batch:
+            hub.publish_threadsafe(trouble_channel(item["trouble_id"]), message_failed_event(item["ack_id"], detail))
+
+    def _count(self, field: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[field] += amount
+
+
+# アプリケーション全体で共有する受付キュー
+message_ingestor = MessageIngestor(
+    max_size=settings.MESSAGE_INGEST_QUEUE_SIZE,
+    batch_size=settings.MESSAGE_INGEST_BATCH_SIZE,
+    flush_interval_seconds=settings.MESSAGE_INGEST_FLUSH_INTERVAL_SECONDS
+)
@@ -0,0 +1,58 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.api.users.models import User
+from app.api.messages.models import Message
+from app.api.messages.schemas import MessageResponse
+
+
+def message_thread_query(db: Session, trouble_id: int):
+    """
+    お困りごとのメッセージ一覧用のクエリ
+    投稿者名をJOINで同時に取得し、作成日時の昇順（同一日時はIDで順序を確定）に並べる
+    """
+    return (
+        db.query(
+            Message.id,
+            Message.content,
+            Message.user_id,
+            Message.trouble_id,
+            Message.created_at,
+            User.name.label("user_name")
+        )
+        .outerjoin(User, User.user_id == Message.user_id)
+        .filter(Message.trouble_id == trouble_id)
+        .order_by(Message.created_at, Message.id)
+    )
+
+
+def to_message_response(row) -> MessageResponse:
+    """
+    message_thread_query の結果行をレスポンススキーマに変換する
+    """
+    return MessageResponse(
+        id=row.id,
+        content=row.content,
+        user_id=row.user_id,
+        user_name=row.user_name or "Unknown",
+        trouble_id=row.trouble_id,
+        created_at=row.created_at
+    )
+
+
+def message_created_event(message: MessageResponse, ack_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    新着メッセージの配信イベントを作成する
+    受付キュー経由で保存した場合は、受付時に返した ack_id を付ける
+    """
+    event: Dict[str, Any] = {"type": "message.created", "message": message.model_dump(mode="json")}
+    if ack_id is not None:
+        event["ack_id"] = ack_id
+    return event
+
+def message_failed_event(ack_id: str, detail: str) -> Dict[str, Any]:
+    """
+    受付キュー経由のメッセージを保存できなかったことを通知するイベントを作成する
+    """
+    return {"type": "message.failed", "ack_id": ack_id, "detail": detail}
@@ -0,0 +1,109 @@
+import logging
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.api.projects.models import CoCreationProject, UserProjectLike
+from app.api.troubles.models import Trouble
+from app.api.messages.models import Message
+
+logger = logging.getLogger(__name__)
+
+
+def increment_project_counters(db: Session, project_id: int, likes: int = 0, comments: int = 0) -> None:
+    """
+    プロジェクトのいいね数・コメント数を加算する
+    コミットは呼び出し側で行い、いいね・メッセージの書き込みと同一トランザクションで反映する
+    """
+    values = {}
+    if likes:
+        values["likes_count"] = CoCreationProject.likes_count + likes
+    if comments:
+        values["comments_count"] = CoCreationProject.comments_count + comments
+    if not values:
+        return
+
+    db.execute(
+        update(CoCreationProject)
+        .where(CoCreationProject.project_id == project_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def increment_trouble_comments(db: Session, trouble_id: int, comments: int = 1) -> None:
+    """
+    お困りごとのコメント数を加算する
+    コミットは呼び出し側で行い、メッセージの書き込みと同一トランザクションで反映する
+    """
+    db.execute(
+        update(Trouble)
+        .where(Trouble.trouble_id == trouble_id)
+        .values(comments_count=Trouble.comments_count + comments)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_project_counters(db: Session) -> int:
+    """
+    実テーブルの件数と食い違っているカウンターを修復する
+
+    :param db: データベースセッション
+    :return: 修復したプロジェクト数
+    """
+    actual_likes = (
+        select(func.count())
+        .select_from(UserProjectLike)
+        .where(UserProjectLike.project_id == CoCreationProject.project_id)
+        .scalar_subquery()
+    )
+    actual_comments = (
+        select(func.count())
+        .select_from(Message)
+        .join(Trouble, Trouble.trouble_id == Message.trouble_id)
+        .where(Trouble.project_id == CoCreationProject.project_id)
+        .scalar_subquery()
+    )
+
+    result = db.execute(
+        update(CoCreationProject)
+        .where(or_(
+            CoCreationProject.likes_count != actual_likes,
+            CoCreationProject.comments_count != actual_comments
+        ))
+        .values(likes_count=actual_likes, comments_count=actual_comments)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if result.rowcount:
+        logger.info("プロジェクトカウンターを修復しました: %d件", result.rowcount)
+    return result.rowcount
+
+
+def reconcile_trouble_counters(db: Session) -> int:
+    """
+    実際のメッセージ数と食い違っているお困りごとのコメント数を修復する
+
+    :param db: データベースセッション
+    :return: 修復したお困りごと数
+    """
+    # messages(trouble_id, created_at) インデックスで件数を数える
+    actual_comments = (
+        select(func.count())
+        .select_from(Message)
+        .where(Message.trouble_id == Trouble.trouble_id)
+        .scalar_subquery()
+    )
+
+    result = db.execute(
+        update(Trouble)
+        .where(Trouble.comments_count != actual_comments)
+        .values(comments_count=actual_comments)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if result.rowcount:
+        logger.info("お困りごとのコメント数を修復しました: %d件", result.rowcount)
+    return result.rowcount
@@ -0,0 +1,186 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy.orm import Session, aliased
+
+from app.core.database import SessionLocal
+from app.api.users.models import User
+from app.api.projects.models import CoCreationProject
+from app.api.troubles.models import Trouble
+from app.api.messages.models import Message
+
+# 1回の読み込み・書き出しでまとめる行数とバイト数
+EXPORT_YIELD_PER = 500
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+CSV_COLUMNS = [
+    "project_id",
+    "project_title",
+    "trouble_id",
+    "trouble_category_id",
+    "trouble_status",
+    "trouble_creator_user_id",
+    "trouble_creator_name",
+    "trouble_created_at",
+    "trouble_description",
+    "message_id",
+    "message_user_id",
+    "message_user_name",
+    "message_created_at",
+    "message_content",
+]
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _export_rows(db: Session, project_id: int):
+    """
+    プロジェクトのお困りごととメッセージを1本のクエリで順に読み出す
+    サーバーサイドカーソルで EXPORT_YIELD_PER 行ずつ取得し、全件をメモリに載せない
+    """
+    trouble_creator = aliased(User)
+    message_user = aliased(User)
+    return (
+        db.query(
+            Trouble.trouble_id,
+            Trouble.category_id,
+            Trouble.status,
+            Trouble.creator_user_id,
+            trouble_creator.name.label("creator_name"),
+            Trouble.created_at,
+            Trouble.description,
+            Message.id.label("message_id"),
+            Message.user_id.label("message_user_id"),
+            message_user.name.label("message_user_name"),
+            Message.created_at.label("message_created_at"),
+            Message.content.label("message_content")
+        )
+        .outerjoin(trouble_creator, trouble_creator.user_id == Trouble.creator_user_id)
+        .outerjoin(Message, Message.trouble_id == Trouble.trouble_id)
+        .outerjoin(message_user, message_user.user_id == Message.user_id)
+        .filter(Trouble.project_id == project_id)
+        .order_by(Trouble.created_at, Trouble.trouble_id, Message.created_at, Message.id)
+        .execution_options(stream_results=True, yield_per=EXPORT_YIELD_PER)
+    )
+
+
+def _project_header(db: Session, project_id: int) -> Dict[str, Any]:
+    project = (
+        db.query(
+            CoCreationProject.project_id,
+            CoCreationProject.title,
+            CoCreationProject.summary,
+            CoCreationProject.description,
+            CoCreationProject.creator_user_id,
+            CoCreationProject.created_at
+        )
+        .filter(CoCreationProject.project_id == project_id)
+        .one()
+    )
+    return {
+        "type": "project",
+        "project_id": project.project_id,
+        "title": project.title,
+        "summary": project.summary,
+        "description": project.description,
+        "creator_user_id": project.creator_user_id,
+        "created_at": _isoformat(project.created_at),
+    }
+
+
+def _buffered(lines: Iterator[str]) -> Iterator[bytes]:
+    # 細かい行をまとめ、一定サイズごとに書き出す
+    buffer = io.StringIO()
+    for line in lines:
+        buffer.write(line)
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer = io.StringIO()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_project_ndjson(project_id: int) -> Iterator[bytes]:
+    """
+    プロジェクト・お困りごと・メッセージを1行1件のJSONで順に書き出す
+    StreamingResponse から呼ばれるため、リクエストとは別のセッションを使う
+    """
+    def lines() -> Iterator[str]:
+        db = SessionLocal()
+        try:
+            yield json.dumps(_project_header(db, project_id), ensure_ascii=False) + "\n"
+            current_trouble_id = None
+            for row in _export_rows(db, project_id):
+                if row.trouble_id != current_trouble_id:
+                    current_trouble_id = row.trouble_id
+                    yield json.dumps({
+                        "type": "trouble",
+                        "trouble_id": row.trouble_id,
+                        "category_id": row.category_id,
+                        "status": row.status,
+                        "creator_user_id": row.creator_user_id,
+                        "creator_name": row.creator_name,
+                        "created_at": _isoformat(row.created_at),
+                        "description": row.description,
+                    }, ensure_ascii=False) + "\n"
+                if row.message_id is not None:
+                    yield json.dumps({
+                        "type": "message",
+                        "message_id": row.message_id,
+                        "trouble_id": row.trouble_id,
+                        "user_id": row.message_user_id,
+                        "user_name": row.message_user_name,
+                        "created_at": _isoformat(row.message_created_at),
+                        "content": row.message_content,
+                    }, ensure_ascii=False) + "\n"
+        finally:
+            db.close()
+
+    return _buffered(lines())
+
+
+def iter_project_csv(project_id: int) -> Iterator[bytes]:
+    """
+    お困りごととメッセージを1メッセージ1行のCSVで書き出す（メッセージのないお困りごとは1行）
+    StreamingResponse から呼ばれるため、リクエストとは別のセッションを使う
+    """
+    def lines() -> Iterator[str]:
+        line = io.StringIO()
+        writer = csv.writer(line)
+
+        def render(values) -> str:
+            line.seek(0)
+            line.truncate()
+            writer.writerow(values)
+            return line.getvalue()
+
+        db = SessionLocal()
+        try:
+            project = _project_header(db, project_id)
+            # Excelで文字化けしないようBOMを付ける
+            yield "\ufeff" + render(CSV_COLUMNS)
+            for row in _export_rows(db, project_id):
+                yield render([
+                    project["project_id"],
+                    project["title"],
+                    row.trouble_id,
+                    row.category_id,
+                    row.status,
+                    row.creator_user_id,
+                    row.creator_name,
+                    _isoformat(row.created_at),
+                    row.description,
+                    row.message_id,
+                    row.message_user_id,
+                    row.message_user_name,
+                    _isoformat(row.message_created_at),
+                    row.message_content,
+                ])
+        finally:
+            db.close()
+
+    return _buffered(lines())
@@ -0,0 +1,144 @@
+import json
+from datetime import datetime
+from typing import Any, List
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.api.projects.models import CoCreationProject
+from app.api.projects.schemas import ProjectCreate, ProjectImportResult
+from app.services.category_catalog import project_category_catalog
+from app.services.projects import invalidate_project_feed
+from app.services.search_index import project_search_index
+
+
+class InvalidImportItem:
+    """
+    JSONとして読めなかった入力行（結果にエラーとして記録する）
+    """
+
+    def __init__(self, error: str):
+        self.error = error
+
+
+def parse_ndjson_line(line: bytes) -> Any:
+    """
+    NDJSONの1行を読み込む（不正な行は InvalidImportItem として返す）
+    """
+    try:
+        return json.loads(line)
+    except ValueError:
+        return InvalidImportItem("JSONの形式が不正です")
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def import_projects(db: Session, items: List[Any], user_id: int) -> List[ProjectImportResult]:
+    """
+    プロジェクトを一括登録する
+    - カテゴリーIDはカタログから読み込んだ集合で検証する
+      （ない場合は他ワーカーで作成された可能性があるため、一括登録ごとに一度だけ読み直す）
+    - 検証を通った行はチャンクごとの複数行INSERTで、1トランザクションにまとめて登録する
+    - 検証エラーの行は登録せず、結果にエラー内容を記録する
+
+    :param db: データベースセッション
+    :param items: ProjectCreate 相当の辞書（または InvalidImportItem）のリスト
+    :param user_id: 登録するユーザーのID
+    :return: 入力順の登録結果
+    """
+    category_ids = set(project_category_catalog.snapshot(db).names)
+    catalog_reloaded = False
+    created_at = datetime.now()
+
+    results: List[ProjectImportResult] = []
+    rows = []
+    row_results: List[ProjectImportResult] = []
+
+    for index, item in enumerate(items):
+        if isinstance(item, InvalidImportItem):
+            results.append(ProjectImportResult(index=index, status="error", error=item.error))
+            continue
+
+        try:
+            project = ProjectCreate.model_validate(item)
+        except ValidationError as e:
+            results.append(ProjectImportResult(index=index, status="error", error=_validation_message(e)))
+            continue
+
+        # 単体登録（create_project）と同じ検証
+        error = None
+        if project.category_id and project.category_id not in category_ids and not catalog_reloaded:
+            project_category_catalog.invalidate()
+            category_ids = set(project_category_catalog.snapshot(db).names)
+            catalog_reloaded = True
+        if not project.title or not project.description:
+            error = "必須項目を入力してください"
+        elif project.creator_user_id != user_id:
+            error = "自分以外のユーザーIDでプロジェクトを作成することはできません"
+        elif project.category_id and project.category_id not in category_ids:
+            error = "指定されたカテゴリーが見つかりません"
+
+        result = ProjectImportResult(index=index, status="error" if error else "created", error=error)
+        results.append(result)
+        if error:
+            continue
+
+        rows.append({
+            "title": project.title,
+            "summary": project.summary,
+            "description": project.description,
+            "creator_user_id": user_id,
+            "category_id": project.category_id,
+            "created_at": created_at,
+            "likes_count": 0,
+            "comments_count": 0,
+            "row_version": 1,
+        })
+        row_results.append(result)
+
+    if not rows:
+        return results
+
+    try:
+        # 登録前の最大IDを控え、登録後に採番されたIDを入力順に対応付ける
+        max_project_id = db.query(func.max(CoCreationProject.project_id)).scalar() or 0
+
+        chunk_size = settings.PROJECT_BULK_CHUNK_SIZE
+        for start in range(0, len(rows), chunk_size):
+            db.execute(insert(CoCreationProject).values(rows[start:start + chunk_size]))
+
+        created = (
+            db.query(
+                CoCreationProject.project_id,
+                CoCreationProject.title,
+                CoCreationProject.summary,
+                CoCreationProject.description
+            )
+            .filter(
+                CoCreationProject.creator_user_id == user_id,
+                CoCreationProject.project_id > max_project_id
+            )
+            .order_by(CoCreationProject.project_id)
+            .all()
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # 同じユーザーの並行登録が混ざった場合は対応付けが保証できないためIDを返さない
+    if len(created) == len(row_results):
+        for result, project in zip(row_results, created):
+            result.project_id = project.project_id
+
+    for project in created:
+        project_search_index.index_project(project)
+    invalidate_project_feed()
+
+    return results
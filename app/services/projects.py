@@ -0,0 +1,181 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.etag import make_etag
+from app.api.users.models import User
+from app.api.projects.models import CoCreationProject
+from app.api.projects.schemas import ProjectResponse, CategoryResponse
+from app.services.cache import result_cache
+from app.services.category_catalog import CategorySnapshot, project_category_catalog
+from app.services.favorites import favorite_store
+from app.services.trouble_stats import STATUS_OPEN, STATUS_RESOLVED, project_trouble_counts
+
+# トップページ用フィードのキャッシュキー
+PROJECT_FEED_CACHE_PREFIX = "projects:feed:"
+PROJECT_FEED_NEW_KEY = PROJECT_FEED_CACHE_PREFIX + "new"
+PROJECT_FEED_TOTAL_KEY = PROJECT_FEED_CACHE_PREFIX + "total"
+
+
+def project_feed_favorites_key(user_id: int) -> str:
+    """ユーザーごとのお気に入りフィードのキャッシュキー"""
+    return f"{PROJECT_FEED_CACHE_PREFIX}favorites:{user_id}"
+
+
+def invalidate_project_feed(user_id: Optional[int] = None) -> None:
+    """
+    トップページ用フィードのキャッシュを無効化する
+    user_id を指定した場合はそのユーザーのお気に入りフィードのみを無効化する
+    """
+    if user_id is None:
+        result_cache.invalidate_prefix(PROJECT_FEED_CACHE_PREFIX)
+    else:
+        result_cache.invalidate(project_feed_favorites_key(user_id))
+
+
+def project_response_options():
+    """
+    プロジェクトのレスポンス構築に必要なリレーションを一括で読み込むオプション
+    作成者をJOINで取得し、行ごとの追加クエリを発生させない
+    （カテゴリー名はカテゴリーカタログから解決する）
+    """
+    return (
+        joinedload(CoCreationProject.creator),
+    )
+
+
+def load_favorite_project_ids(
+    db: Session,
+    user_id: Optional[int],
+    project_ids: Iterable[int]
+) -> Set[int]:
+    """
+    指定したプロジェクトのうち、ユーザーがお気に入り登録しているIDの集合を取得する
+    お気に入りはユーザーごとにメモリに保持しているため、読み込み済みであればクエリは発生しない
+    """
+    if user_id is None:
+        return set()
+    return favorite_store.favorite_ids_among(db, user_id, project_ids)
+
+
+def to_project_response(
+    project: CoCreationProject,
+    categories: CategorySnapshot,
+    is_favorite: bool = False,
+    trouble_counts: Optional[Dict[str, int]] = None
+) -> ProjectResponse:
+    """
+    読み込み済みのプロジェクトをレスポンススキーマに変換する（追加クエリなし）
+
+    :param trouble_counts: project_trouble_counts で取得したステータス別のお困りごと数
+    """
+    creator = project.creator
+    category_name = categories.get_name(project.category_id)
+    trouble_counts = trouble_counts or {}
+
+    return ProjectResponse(
+        project_id=project.project_id,
+        title=project.title,
+        summary=project.summary,
+        description=project.description,
+        creator_user_id=project.creator_user_id,
+        creator_name=creator.name if creator else "不明",
+        created_at=project.created_at,
+        updated_at=project.updated_at,
+        likes=project.likes_count or 0,
+        comments=project.comments_count or 0,
+        open_troubles=trouble_counts.get(STATUS_OPEN, 0),
+        resolved_troubles=trouble_counts.get(STATUS_RESOLVED, 0),
+        is_favorite=is_favorite,
+        category_id=project.category_id,
+        category=CategoryResponse(
+            category_id=project.category_id,
+            name=category_name
+        ) if category_name is not None else None
+    )
+
+
+def to_project_responses(
+    db: Session,
+    projects: List[CoCreationProject],
+    user_id: Optional[int]
+) -> List[ProjectResponse]:
+    """
+    プロジェクト一覧をレスポンススキーマに変換する
+    お気に入り判定はメモリ上のお気に入りストアで行い、お困りごと数は1回のクエリでまとめて取得する
+    """
+    favorite_ids = load_favorite_project_ids(db, user_id, (p.project_id for p in projects))
+    trouble_counts = project_trouble_counts(db, (p.project_id for p in projects))
+    categories = project_category_catalog.snapshot(db)
+    return [
+        to_project_response(
+            project,
+            categories,
+            project.project_id in favorite_ids,
+            trouble_counts.get(project.project_id)
+        )
+        for project in projects
+    ]
+
+
+class ProjectDetailState:
+    """
+    プロジェクト詳細のETagと、その計算に使ったお気に入り状態・お困りごと数・カテゴリー一覧
+    ETagが一致しない場合も、同じ値をレスポンスの作成に使い回す
+    """
+
+    def __init__(
+        self,
+        etag: str,
+        is_favorite: bool,
+        trouble_counts: Optional[Dict[str, int]],
+        categories: CategorySnapshot
+    ):
+        self.etag = etag
+        self.is_favorite = is_favorite
+        self.trouble_counts = trouble_counts
+        self.categories = categories
+
+    def to_response(self, project: CoCreationProject) -> ProjectResponse:
+        return to_project_response(project, self.categories, self.is_favorite, self.trouble_counts)
+
+
+def project_detail_state(db: Session, project_id: int, user_id: Optional[int]) -> Optional[ProjectDetailState]:
+    """
+    プロジェクト詳細レスポンスのETagを求める（プロジェクトが存在しない場合はNone）
+    主キーでの1回の検索で、レスポンスに影響する値（行バージョン・更新日時・カウンター・作成者名）を取得する
+    カテゴリー名とお気に入り状態はメモリ上のカタログ・ストアから取得する
+    お困りごと数は行バージョンに反映されないため、集計テーブルから取得して含める
+    """
+    row = (
+        db.query(
+            CoCreationProject.row_version,
+            CoCreationProject.updated_at,
+            CoCreationProject.likes_count,
+            CoCreationProject.comments_count,
+            CoCreationProject.category_id,
+            User.name
+        )
+        .outerjoin(User, User.user_id == CoCreationProject.creator_user_id)
+        .filter(CoCreationProject.project_id == project_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    is_favorite = project_id in load_favorite_project_ids(db, user_id, [project_id])
+    trouble_counts = project_trouble_counts(db, [project_id]).get(project_id)
+    categories = project_category_catalog.snapshot(db)
+    etag = make_etag(
+        "project",
+        project_id,
+        row.row_version,
+        row.updated_at,
+        row.likes_count,
+        row.comments_count,
+        categories.get_name(row.category_id),
+        row.name,
+        is_favorite,
+        sorted((trouble_counts or {}).items())
+    )
+    return ProjectDetailState(etag, is_favorite, trouble_counts, categories)
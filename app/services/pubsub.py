@@ -0,0 +1,180 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, Dict[str, Any]], None]
+
+
+class PubSubBackend:
+    """
+    ハブ間でメッセージを受け渡す経路のインターフェース
+    受信したメッセージは start() で渡された deliver を通じてローカルの購読者に配信する
+    """
+
+    async def start(self, deliver: Deliver) -> None:
+        raise NotImplementedError
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        pass
+
+
+class InProcessBackend(PubSubBackend):
+    """
+    同一プロセス内の購読者にのみ配信する（ワーカー1つの場合の既定）
+    """
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self._deliver(channel, message)
+
+
+class LocalBrokerBackend(PubSubBackend):
+    """
+    app.services.broker で起動したローカルブローカー経由で、複数ワーカー間に配信する
+    ブローカーは受け取ったメッセージを接続中の全ワーカーに転送し、各ワーカーが自身の購読者に配信する
+    """
+
+    def __init__(self, host: str, port: int, reconnect_seconds: float = 1.0):
+        self.host = host
+        self.port = port
+        self.reconnect_seconds = reconnect_seconds
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        if self._writer is None:
+            # ブローカーに接続できない間は、少なくとも自ワーカーの購読者には届ける
+            self._deliver(channel, message)
+            return
+        line = json.dumps({"op": "publish", "channel": channel, "message": message}, ensure_ascii=False)
+        self._writer.write(line.encode("utf-8") + b"\n")
+        await self._writer.drain()
+
+    async def stop(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                # 配信を受け取る接続であることをブローカーに伝える
+                writer.write(json.dumps({"op": "subscribe"}).encode("utf-8") + b"\n")
+                await writer.drain()
+                self._writer = writer
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    event = json.loads(line)
+                    if event.get("op") == "publish":
+                        self._deliver(event["channel"], event["message"])
+            except asyncio.CancelledError:
+                raise
+            except (OSError, ValueError):
+                logger.warning("ブローカー %s:%d との接続に失敗しました。再接続します", self.host, self.port)
+            self._writer = None
+            await asyncio.sleep(self.reconnect_seconds)
+
+
+class PubSubHub:
+    """
+    チャンネル（例: "trouble:1"）単位のプロセス内Pub/Sub
+    - 購読者ごとに上限付きのキューを持ち、溢れた場合は古いメッセージから捨てる
+    - 同期エンドポイント（スレッドプール）からは publish_threadsafe() で発行する
+    """
+
+    def __init__(self, backend: Optional[PubSubBackend] = None, queue_size: int = 100):
+        self.backend = backend or InProcessBackend()
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self.backend.start(self._deliver)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+        self._loop = None
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        """
+        チャンネルを購読し、配信されたメッセージが入るキューを返す
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        await self.backend.publish(channel, message)
+
+    def publish_threadsafe(self, channel: str, message: Dict[str, Any]) -> None:
+        """
+        イベントループ外のスレッドから発行する（ハブが起動していない場合は何もしない）
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        future = asyncio.run_coroutine_threadsafe(self.publish(channel, message), loop)
+        future.add_done_callback(_log_publish_error)
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+    def _deliver(self, channel: str, message: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+
+def _log_publish_error(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("メッセージの配信に失敗しました", exc_info=future.exception())
+
+
+def create_backend() -> PubSubBackend:
+    """
+    設定 PUBSUB_BACKEND に応じたバックエンドを作成する（"inprocess" または "broker"）
+    """
+    if settings.PUBSUB_BACKEND == "broker":
+        return LocalBrokerBackend(settings.PUBSUB_BROKER_HOST, settings.PUBSUB_BROKER_PORT)
+    return InProcessBackend()
+
+
+# アプリケーション全体で共有するPub/Subハブ
+hub = PubSubHub(create_backend())
+
+
+def trouble_channel(trouble_id: int) -> str:
+    """お困りごとスレッドのチャンネル名"""
+    return f"trouble:{trouble_id}"
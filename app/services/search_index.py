@@ -0,0 +1,215 @@
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.api.projects.models import CoCreationProject
+
+# 文字n-gramの長さ（形態素解析なしで日本語を扱うためバイグラムを使用）
+NGRAM_SIZE = 2
+# タイトルの語をスコア上で何倍に数えるか
+TITLE_WEIGHT = 2
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    テキストを文字n-gramに分割する
+    NFKC正規化と小文字化を行い、記号・空白で区切った語ごとにn-gramを作る
+    （n文字以下の語はそのまま1トークンとする）
+    """
+    if not text:
+        return []
+
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for word in _WORD_PATTERN.findall(normalized):
+        if len(word) <= NGRAM_SIZE:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+    return tokens
+
+
+def _document_terms(title: Optional[str], summary: Optional[str], description: Optional[str]) -> Counter:
+    terms = Counter(tokenize(summary))
+    terms.update(tokenize(description))
+    for term in tokenize(title):
+        terms[term] += TITLE_WEIGHT
+    return terms
+
+
+class ProjectSearchIndex:
+    """
+    プロジェクトのタイトル・概要・説明文に対する転置インデックス
+    - 起動時にDBから構築し、作成・更新時に1件ずつ差し替える
+    - スコアはBM25
+    - 1文字のクエリは、その文字を含むバイグラムのポスティングをまとめて検索する
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # 文字 → その文字を含む語（1文字のクエリ用）
+        self._terms_by_char: Dict[str, Set[str]] = {}
+        # 更新・削除時にポスティングを辿るための、文書ごとの語の一覧
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self.loaded = False
+
+    def rebuild(self, db: Session) -> None:
+        """
+        データベースの全プロジェクトからインデックスを作り直す
+        """
+        postings: Dict[str, Dict[int, int]] = {}
+        terms_by_char: Dict[str, Set[str]] = {}
+        doc_terms: Dict[int, Tuple[str, ...]] = {}
+        doc_lengths: Dict[int, int] = {}
+        total_length = 0
+
+        rows = (
+            db.query(
+                CoCreationProject.project_id,
+                CoCreationProject.title,
+                CoCreationProject.summary,
+                CoCreationProject.description
+            )
+            .execution_options(yield_per=1000)
+        )
+        for row in rows:
+            terms = _document_terms(row.title, row.summary, row.description)
+            for term, frequency in terms.items():
+                postings.setdefault(term, {})[row.project_id] = frequency
+            doc_terms[row.project_id] = tuple(terms)
+            length = sum(terms.values())
+            doc_lengths[row.project_id] = length
+            total_length += length
+        for term in postings:
+            for char in set(term):
+                terms_by_char.setdefault(char, set()).add(term)
+
+        with self._lock:
+            self._postings = postings
+            self._terms_by_char = terms_by_char
+            self._doc_terms = doc_terms
+            self._doc_lengths = doc_lengths
+            self._total_length = total_length
+            self.loaded = True
+
+    def ensure_loaded(self, db: Session) -> None:
+        """
+        未構築の場合のみインデックスを構築する
+        """
+        if not self.loaded:
+            self.rebuild(db)
+
+    def index_project(self, project: CoCreationProject) -> None:
+        """
+        プロジェクト1件を追加、または既存の内容を差し替える
+        """
+        terms = _document_terms(project.title, project.summary, project.description)
+        with self._lock:
+            self._remove_locked(project.project_id)
+            for term, frequency in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    for char in set(term):
+                        self._terms_by_char.setdefault(char, set()).add(term)
+                postings[project.project_id] = frequency
+            length = sum(terms.values())
+            self._doc_terms[project.project_id] = tuple(terms)
+            self._doc_lengths[project.project_id] = length
+            self._total_length += length
+
+    def remove_project(self, project_id: int) -> None:
+        """
+        プロジェクトをインデックスから取り除く
+        """
+        with self._lock:
+            self._remove_locked(project_id)
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[int, float]]:
+        """
+        クエリに一致するプロジェクトをスコアの高い順に返す
+
+        :return: (プロジェクトID, スコア) のリスト
+        """
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return []
+
+        with self._lock:
+            document_count = len(self._doc_lengths)
+            if not document_count:
+                return []
+            average_length = self._total_length / document_count
+            doc_lengths = self._doc_lengths
+            k1 = self.k1
+            length_factor = k1 * self.b / average_length
+            base_factor = k1 * (1 - self.b)
+
+            scores: Dict[int, float] = {}
+            for term in query_terms:
+                postings = self._postings_for_locked(term)
+                if not postings:
+                    continue
+                document_frequency = len(postings)
+                idf = math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+                for project_id, frequency in postings.items():
+                    norm = base_factor + length_factor * doc_lengths[project_id]
+                    scores[project_id] = scores.get(project_id, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _postings_for_locked(self, term: str) -> Optional[Dict[int, int]]:
+        """
+        語のポスティングを返す
+        1文字の語はバイグラムの一部としてしか索引されないため、その文字を含む語の出現回数を文書ごとに合算する
+        """
+        if len(term) != 1 or NGRAM_SIZE == 1:
+            return self._postings.get(term)
+        merged: Dict[int, int] = {}
+        for indexed_term in self._terms_by_char.get(term, ()):
+            for project_id, frequency in self._postings[indexed_term].items():
+                merged[project_id] = merged.get(project_id, 0) + frequency
+        return merged
+
+    def _remove_locked(self, project_id: int) -> None:
+        terms = self._doc_terms.pop(project_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(project_id, None)
+                if not postings:
+                    del self._postings[term]
+                    for char in set(term):
+                        char_terms = self._terms_by_char.get(char)
+                        if char_terms is not None:
+                            char_terms.discard(term)
+                            if not char_terms:
+                                del self._terms_by_char[char]
+        self._total_length -= self._doc_lengths.pop(project_id, 0)
+
+
+# アプリケーション全体で共有する検索インデックス
+project_search_index = ProjectSearchIndex()
+
+
+def rebuild_project_search_index(db: Session) -> None:
+    """
+    定期ジョブ用のインデックス再構築関数（他ワーカーでの作成・更新も取り込む）
+    """
+    project_search_index.rebuild(db)
@@ -0,0 +1,151 @@
+"""
+お困りごとのステータス別件数（trouble_status_summary）の更新と集計
+
+集計テーブルを作り直す場合:
+
+    python -m app.services.trouble_stats
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.api.troubles.models import Trouble, TroubleStatusSummary
+
+logger = logging.getLogger(__name__)
+
+# お困りごとのステータス
+STATUS_OPEN = "未解決"
+STATUS_RESOLVED = "解決"
+
+# (プロジェクトID, カテゴリーID, ステータス)
+StatusKey = Tuple[int, int, str]
+
+
+def status_key(trouble: Trouble) -> StatusKey:
+    """お困りごとの集計上のキー（ステータス未設定は未解決として数える）"""
+    return trouble.project_id, trouble.category_id, trouble.status or STATUS_OPEN
+
+
+def _upsert_count(db: Session, key: StatusKey, delta: int) -> None:
+    project_id, category_id, status = key
+    values = {"project_id": project_id, "category_id": category_id, "status": status, "trouble_count": delta}
+    counted = TroubleStatusSummary.trouble_count + delta
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        statement = mysql.insert(TroubleStatusSummary).values(**values)
+        statement = statement.on_duplicate_key_update(trouble_count=counted)
+    else:
+        module = postgresql if dialect == "postgresql" else sqlite
+        statement = module.insert(TroubleStatusSummary).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["project_id", "category_id", "status"],
+            set_={"trouble_count": counted}
+        )
+    db.execute(statement)
+
+
+def adjust_trouble_status_counts(
+    db: Session,
+    removed: Optional[StatusKey] = None,
+    added: Optional[StatusKey] = None
+) -> None:
+    """
+    お困りごとの作成・更新・削除を集計テーブルに反映する
+    コミットは呼び出し側で行い、お困りごとの書き込みと同一トランザクションで反映する
+
+    :param removed: 変更前のキー（作成時はNone）
+    :param added: 変更後のキー（削除時はNone）
+    """
+    if removed == added:
+        return
+    if removed is not None:
+        _upsert_count(db, removed, -1)
+    if added is not None:
+        _upsert_count(db, added, 1)
+
+
+def project_trouble_counts(db: Session, project_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """
+    プロジェクトごとのステータス別件数を1回のクエリで取得する
+
+    :return: {プロジェクトID: {ステータス: 件数}}（お困りごとのないプロジェクトは含まない）
+    """
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+
+    rows = (
+        db.query(
+            TroubleStatusSummary.project_id,
+            TroubleStatusSummary.status,
+            func.sum(TroubleStatusSummary.trouble_count).label("trouble_count")
+        )
+        .filter(TroubleStatusSummary.project_id.in_(project_ids))
+        .group_by(TroubleStatusSummary.project_id, TroubleStatusSummary.status)
+        .all()
+    )
+    counts: Dict[int, Dict[str, int]] = defaultdict(dict)
+    for row in rows:
+        counts[row.project_id][row.status] = int(row.trouble_count)
+    return dict(counts)
+
+
+def project_trouble_breakdown(db: Session, project_id: int):
+    """
+    プロジェクトのカテゴリー・ステータス別の件数を取得する（件数0の行は除く）
+    """
+    return (
+        db.query(
+            TroubleStatusSummary.category_id,
+            TroubleStatusSummary.status,
+            TroubleStatusSummary.trouble_count
+        )
+        .filter(
+            TroubleStatusSummary.project_id == project_id,
+            TroubleStatusSummary.trouble_count > 0
+        )
+        .order_by(TroubleStatusSummary.category_id, TroubleStatusSummary.status)
+        .all()
+    )
+
+
+def rebuild_trouble_status_summary(db: Session) -> int:
+    """
+    お困りごとテーブルから集計テーブルを作り直す
+
+    :return: 集計行数
+    """
+    status = func.coalesce(Trouble.status, STATUS_OPEN)
+    aggregated = (
+        select(Trouble.project_id, Trouble.category_id, status, func.count())
+        .group_by(Trouble.project_id, Trouble.category_id, status)
+    )
+
+    db.execute(delete(TroubleStatusSummary))
+    result = db.execute(
+        insert(TroubleStatusSummary).from_select(
+            ["project_id", "category_id", "status", "trouble_count"], aggregated
+        )
+    )
+    db.commit()
+
+    logger.info("お困りごとのステータス別件数を再集計しました: %d行", result.rowcount)
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    # リレーションシップの参照先を解決できるよう、全モデルを登録してからセッションを開く
+    import app.main  # noqa: F401
+    from app.core.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        rebuild_trouble_status_summary(session)
+    finally:
+        session.close()
@@ -0,0 +1,84 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.etag import make_etag
+from app.api.users.models import User
+from app.api.projects.models import CoCreationProject
+from app.api.troubles.models import Trouble
+from app.api.troubles.schemas import TroubleResponse
+
+
+def trouble_list_query(db: Session):
+    """
+    お困りごと一覧用のクエリ
+    プロジェクト名・作成者名をJOINで同時に取得し、レスポンスに必要なカラムのみを選択する
+    """
+    return (
+        db.query(
+            Trouble.trouble_id,
+            Trouble.description,
+            Trouble.category_id,
+            Trouble.project_id,
+            Trouble.creator_user_id,
+            Trouble.created_at,
+            Trouble.status,
+            Trouble.comments_count,
+            CoCreationProject.title.label("project_title"),
+            User.name.label("creator_name")
+        )
+        .outerjoin(CoCreationProject, CoCreationProject.project_id == Trouble.project_id)
+        .outerjoin(User, User.user_id == Trouble.creator_user_id)
+    )
+
+
+def to_trouble_response(row, response_class=TroubleResponse, **extra) -> TroubleResponse:
+    """
+    trouble_list_query の結果行をレスポンススキーマに変換する
+    """
+    return response_class(
+        trouble_id=row.trouble_id,
+        description=row.description,
+        category_id=row.category_id,
+        project_id=row.project_id,
+        project_title=row.project_title or "Unknown Project",
+        creator_user_id=row.creator_user_id,
+        creator_name=row.creator_name or "Unknown User",
+        created_at=row.created_at,
+        status=row.status,
+        comments=row.comments_count,
+        **extra
+    )
+
+
+def trouble_etag(db: Session, trouble_id: int) -> Optional[str]:
+    """
+    お困りごと詳細レスポンスのETagを求める（お困りごとが存在しない場合はNone）
+    主キーでの1回の検索で、レスポンスに影響する値（行バージョン・更新日時・コメント数・プロジェクト・作成者名）を取得する
+    """
+    row = (
+        db.query(
+            Trouble.row_version,
+            Trouble.updated_at,
+            # コメント数は行バージョンを加算しないUPDATEで更新されるため個別に含める
+            Trouble.comments_count,
+            CoCreationProject.row_version.label("project_row_version"),
+            User.name
+        )
+        .outerjoin(CoCreationProject, CoCreationProject.project_id == Trouble.project_id)
+        .outerjoin(User, User.user_id == Trouble.creator_user_id)
+        .filter(Trouble.trouble_id == trouble_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    return make_etag(
+        "trouble",
+        trouble_id,
+        row.row_version,
+        row.updated_at,
+        row.comments_count,
+        row.project_row_version,
+        row.name
+    )
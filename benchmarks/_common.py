@@ -0,0 +1,133 @@
+"""
+ベンチマーク共通処理
+
+DATABASE_URL / ASYNC_DATABASE_URL が未指定の場合は、一時ディレクトリの SQLite を使う
+（本番相当の数値は MySQL を指定して計測する）
+アプリケーションの設定は import 時に読み込まれるため、app をインポートする前に configure() を呼び出す
+"""
+import os
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), "collabo_bench.db")
+
+STATUSES = ("未解決", "解決")
+
+
+def configure(**overrides: str) -> None:
+    """
+    ベンチマーク用の環境変数を設定する（既に設定されている値は上書きしない）
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH}")
+    os.environ.setdefault("ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{DEFAULT_DB_PATH}")
+    # SQLの出力と開発用の認証スキップを無効にし、本番と同じ経路を計測する
+    os.environ.setdefault("DEBUG", "false")
+    for name, value in overrides.items():
+        os.environ.setdefault(name, value)
+
+
+def reset_database() -> None:
+    """
+    全テーブルを作り直す
+    """
+    import app.main  # noqa: F401 全モデルを登録する
+    from app.core.database import Base, engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def seed(
+    users: int = 100,
+    projects: int = 10,
+    troubles: int = 0,
+    messages_per_trouble: int = 0,
+    password: str = "password",
+    chunk_size: int = 10000,
+) -> None:
+    """
+    計測用のデータを一括で投入する
+    - プロジェクト・お困りごとは作成者・カテゴリー・状態を順番に割り当てる
+    - 全ユーザーのパスワードは password（ハッシュ化は1回のみ）
+    """
+    from sqlalchemy import insert
+
+    from app.core.database import SessionLocal
+    from app.core.security import get_password_hash
+    from app.api.messages.models import Message
+    from app.api.projects.models import CoCreationProject, ProjectCategory
+    from app.api.troubles.models import Trouble, TroubleCategory
+    from app.api.users.models import User
+    from app.services.trouble_stats import rebuild_trouble_status_summary
+
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        hashed = get_password_hash(password)
+        db.execute(insert(ProjectCategory), [{"category_id": i, "name": f"カテゴリー{i}"} for i in range(1, 6)])
+        db.execute(insert(TroubleCategory), [{"category_id": i, "name": f"カテゴリー{i}"} for i in range(1, 6)])
+        db.execute(insert(User), [
+            {"user_id": i, "name": f"user{i}", "password": hashed, "last_login_at": now, "point_total": i}
+            for i in range(1, users + 1)
+        ])
+        db.execute(insert(CoCreationProject), [
+            {
+                "project_id": i,
+                "creator_user_id": i % users + 1,
+                "category_id": i % 5 + 1,
+                "title": f"プロジェクト{i}",
+                "description": "ベンチマーク用のプロジェクト",
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(1, projects + 1)
+        ])
+        for start in range(1, troubles + 1, chunk_size):
+            db.execute(insert(Trouble), [
+                {
+                    "trouble_id": i,
+                    "project_id": i % projects + 1,
+                    "category_id": i % 5 + 1,
+                    "creator_user_id": i % users + 1,
+                    "description": f"お困りごと{i}",
+                    "status": STATUSES[i % 2],
+                    "comments_count": messages_per_trouble,
+                    "created_at": now - timedelta(seconds=i),
+                }
+                for i in range(start, min(start + chunk_size, troubles + 1))
+            ])
+        total_messages = troubles * messages_per_trouble
+        for start in range(0, total_messages, chunk_size):
+            db.execute(insert(Message), [
+                {
+                    "content": f"メッセージ{i}",
+                    "user_id": i % users + 1,
+                    "trouble_id": i // messages_per_trouble + 1,
+                    "created_at": now + timedelta(seconds=i),
+                }
+                for i in range(start, min(start + chunk_size, total_messages))
+            ])
+        db.commit()
+        rebuild_trouble_status_summary(db)
+    finally:
+        db.close()
+
+
+def auth_headers(user_id: int = 1) -> Dict[str, str]:
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def summarize(label: str, seconds: Sequence[float]) -> str:
+    """
+    1回ごとの所要時間（秒）から平均・p50・p95をミリ秒で整形する
+    """
+    ms: List[float] = sorted(value * 1000 for value in seconds)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    return f"{label}: n={len(ms)} mean={statistics.mean(ms):.2f}ms p50={statistics.median(ms):.2f}ms p95={p95:.2f}ms"
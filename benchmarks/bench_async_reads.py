@@ -0,0 +1,130 @@
+"""
+お困りごと一覧の requests/sec を、非同期セッション（run_sync）と同期セッション（スレッドプール）で比較する
+（一覧は同期のエンドポイントで提供している。非同期へ移すのは、MySQL/aiomysql でこの計測が上回ってから）
+
+    python benchmarks/bench_async_reads.py --clients 200 --requests 5000
+
+計測用のサーバーを別プロセスの uvicorn で起動し、同時接続数 --clients で GET を送り続ける
+- sync:  GET /api/v1/troubles/（get_db の同期セッションと def のエンドポイント）
+- async: 同じ処理を get_async_db（AsyncSession + run_sync）と async def のエンドポイントで実行する比較用ルート
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from _common import auth_headers, configure, reset_database, seed, summarize
+
+SYNC_PATH = "/api/v1/troubles/"
+ASYNC_PATH = "/bench/troubles-async"
+
+
+def serve(port: int) -> None:
+    """
+    比較用の非同期ルートを追加したアプリケーションを起動する（子プロセス側）
+    """
+    import uvicorn
+    from fastapi import Depends
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.main import app
+    from app.core.database import get_async_db
+    from app.core.dependencies import get_current_user_snapshot
+    from app.api.troubles.router import _troubles_page
+
+    @app.get(ASYNC_PATH)
+    async def get_troubles_async(
+        project_id: int = None,
+        limit: int = 10,
+        current_user=Depends(get_current_user_snapshot),
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        return await db.run_sync(_troubles_page, project_id, None, None, 0, limit, None, True, False)
+
+    # 待ち行列で接続が空くと切断されないよう、キープアライブを長めにする
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", timeout_keep_alive=60)
+
+
+async def load(base_url: str, path: str, clients: int, total: int, projects: int) -> None:
+    import httpx
+
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, headers=auth_headers(), limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path, params={"project_id": i % projects + 1, "limit": 20})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    print(f"{summarize(path, latencies)} errors={errors} -> {len(latencies) / elapsed:.1f} req/s")
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                await client.get("/")
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--troubles", type=int, default=10000)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--no-seed", action="store_true", help="既存のデータベースをそのまま使う")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # 同期のエンドポイントでは、get_db のセッションの後始末もスレッドプールで行われる
+    # 接続プールが同時リクエスト数より小さいと、処理を終えたリクエストが接続を持ったまま後始末のスレッドを待ち、
+    # 接続待ちのスレッドでスレッドプールが埋まってタイムアウトするため、プールを同時接続数に合わせる
+    configure(DB_POOL_SIZE=str(args.clients), DB_MAX_OVERFLOW="0")
+    if args.serve:
+        serve(args.port)
+        return
+
+    if not args.no_seed:
+        reset_database()
+        seed(users=100, projects=args.projects, troubles=args.troubles)
+
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(args.port)],
+        env=os.environ.copy()
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        print(f"clients={args.clients} requests={args.requests} troubles={args.troubles}")
+        for path in (ASYNC_PATH, SYNC_PATH):
+            asyncio.run(load(base_url, path, args.clients, args.requests, args.projects))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
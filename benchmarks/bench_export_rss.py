@@ -0,0 +1,78 @@
+"""
+プロジェクトのエクスポート（NDJSON / CSV）のピークメモリ（RSS）を、プロジェクトの大きさごとに計測する
+
+    python benchmarks/bench_export_rss.py --sizes 1000 10000 100000 --messages-per-trouble 10
+
+大きさ（お困りごとの件数）ごとに1プロジェクトを作り直し、形式ごとに別プロセスで全件を書き出す
+子プロセスの ru_maxrss から、書き出し前との差分（ピークの増分）を求める
+ストリーミングできていれば、増分はプロジェクトの大きさにほぼ比例しない
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from _common import configure, reset_database, seed
+
+FORMATS = ("ndjson", "csv")
+
+
+def max_rss_mb() -> float:
+    # Linux の ru_maxrss はKB単位
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def export(export_format: str) -> None:
+    """
+    プロジェクト1を書き出し、計測結果を1行のJSONで出力する（子プロセス側）
+    """
+    from app.services.project_export import iter_project_csv, iter_project_ndjson
+
+    iterate = iter_project_ndjson if export_format == "ndjson" else iter_project_csv
+    baseline = max_rss_mb()
+    started = time.perf_counter()
+    size = 0
+    for chunk in iterate(1):
+        size += len(chunk)
+    print(json.dumps({
+        "seconds": time.perf_counter() - started,
+        "bytes": size,
+        "baseline_mb": baseline,
+        "peak_mb": max_rss_mb(),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--messages-per-trouble", type=int, default=10)
+    parser.add_argument("--child", choices=FORMATS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    configure()
+    if args.child:
+        export(args.child)
+        return
+
+    print(f"messages_per_trouble={args.messages_per_trouble}")
+    for troubles in args.sizes:
+        reset_database()
+        seed(users=100, projects=1, troubles=troubles, messages_per_trouble=args.messages_per_trouble)
+        for export_format in FORMATS:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", export_format],
+                env=os.environ.copy(), check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{export_format} troubles={troubles}: {result['bytes'] / 1024 / 1024:.1f}MB "
+                f"in {result['seconds']:.2f}s peak_rss={result['peak_mb']:.1f}MB "
+                f"(+{result['peak_mb'] - result['baseline_mb']:.1f}MB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+ログイン（POST /api/v1/auth/login）の logins/sec と、CPUコアあたりの値を計測する
+
+    python benchmarks/bench_login.py --workers 1 --clients 50 --logins 500
+
+計測用のサーバーを別プロセスの uvicorn（--workers 本）で起動し、同時接続数 --clients でログインを送り続ける
+- ログイン試行制限は無効にする（同じユーザーへの連続ログインが 429 にならないように）
+- bcrypt のコストは BCRYPT_ROUNDS（既定は本番と同じ設定値）
+- ログインはパスワード検証が支配的なため、コアあたりの値は logins/sec をCPUコア数で割って求める
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from _common import configure, reset_database, seed, summarize
+from bench_async_reads import wait_until_ready
+
+LOGIN_PATH = "/api/v1/auth/login"
+PASSWORD = "password"
+
+
+async def load(base_url: str, clients: int, total: int, users: int) -> float:
+    import httpx
+
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(LOGIN_PATH, params={"username": f"user{i % users + 1}", "password": PASSWORD})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    print(f"{summarize('login', latencies)} errors={errors}")
+    return len(latencies) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8098)
+    args = parser.parse_args()
+
+    configure(LOGIN_THROTTLE_ENABLED="false")
+    reset_database()
+    seed(users=args.users, projects=1, password=PASSWORD)
+
+    from app.core.config import settings
+
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=os.environ.copy()
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        cores = os.cpu_count() or 1
+        print(
+            f"workers={args.workers} clients={args.clients} logins={args.logins} "
+            f"bcrypt_rounds={settings.BCRYPT_ROUNDS} cpu_count={cores}"
+        )
+        rate = asyncio.run(load(base_url, args.clients, args.logins, args.users))
+        print(f"{rate:.1f} logins/s -> {rate / cores:.1f} logins/s per core")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
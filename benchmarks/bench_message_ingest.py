@@ -0,0 +1,103 @@
+"""
+メッセージ投稿のスループット（msgs/s）を、1件ずつ保存する経路と受付キュー（MessageIngestor）で比較する
+
+    python benchmarks/bench_message_ingest.py --messages 20000 --writers 8 --threads 5
+
+- sync:   POST /messages/ と同じ処理（1件ごとに INSERT・カウンター加算・コミット・refresh）を --writers 本のスレッドで実行
+- ingest: 同じ件数を --writers 本のスレッドから submit() し、stop() で保存し終えるまでの時間を計測
+書き込みは --threads 件のお困りごとに振り分ける（少ないほど同じ行のカウンター更新が集中する）
+"""
+import argparse
+import threading
+import time
+from typing import Callable
+
+from _common import configure, reset_database, seed
+
+PROJECTS = 10
+
+
+def run_writers(writers: int, total: int, write: Callable[[int], None]) -> float:
+    """
+    total 件を writers 本のスレッドで分担して書き込み、所要時間（秒）を返す
+    """
+    counter = iter(range(total))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            write(i)
+
+    threads = [threading.Thread(target=worker) for _ in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def bench_sync(total: int, writers: int, troubles: int) -> None:
+    from app.core.database import SessionLocal
+    from app.core.token_cache import UserSnapshot
+    from app.api.messages.router import create_message
+    from app.api.messages.schemas import MessageCreate
+
+    user = UserSnapshot(user_id=1, name="user1")
+
+    def write(i: int) -> None:
+        db = SessionLocal()
+        try:
+            create_message(MessageCreate(content=f"同期メッセージ{i}", trouble_id=i % troubles + 1), user, db)
+        finally:
+            db.close()
+
+    elapsed = run_writers(writers, total, write)
+    print(f"sync:   {total} messages in {elapsed:.2f}s -> {total / elapsed:.1f} msgs/s")
+
+
+def bench_ingest(total: int, writers: int, troubles: int, batch_size: int) -> None:
+    from app.services.message_ingest import MessageIngestor
+
+    # 受付で拒否されないよう、キューは全件を積める大きさにする
+    ingestor = MessageIngestor(max_size=total, batch_size=batch_size)
+    ingestor.start()
+
+    def write(i: int) -> None:
+        trouble_id = i % troubles + 1
+        # seed() ではお困りごと i のプロジェクトは i % projects + 1
+        ingestor.submit(trouble_id, trouble_id % PROJECTS + 1, 1, "user1", f"受付メッセージ{i}")
+
+    started = time.perf_counter()
+    accepted = run_writers(writers, total, write)
+    ingestor.stop()
+    elapsed = time.perf_counter() - started
+    stats = ingestor.stats()
+    print(
+        f"ingest: {total} messages in {elapsed:.2f}s (submit {accepted:.2f}s) -> {total / elapsed:.1f} msgs/s "
+        f"stored={stats['stored']} failed={stats['failed']} batches={stats['batches']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=5, help="書き込み先のお困りごとの件数")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    configure()
+    reset_database()
+    seed(users=10, projects=PROJECTS, troubles=args.threads)
+    print(f"messages={args.messages} writers={args.writers} threads={args.threads} batch_size={args.batch_size}")
+    bench_sync(args.messages, args.writers, args.threads)
+    bench_ingest(args.messages, args.writers, args.threads, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+お困りごと一覧（_troubles_page）の1ページの取得時間を、大量のお困りごとに対して計測する
+
+    python benchmarks/bench_troubles_list.py --troubles 1000000 --repeat 50
+
+絞り込み条件ごとに以下を計測する
+- offset: 先頭ページと深いページ（--deep-skip）
+- cursor: 深いページと同じ位置から next_cursor で取得
+- total:  総数の取得（キャッシュを毎回捨てて COUNT を実行）
+"""
+import argparse
+import time
+from typing import Callable, Dict, List, Optional
+
+from _common import configure, reset_database, seed, summarize
+
+
+def measure(repeat: int, run: Callable[[], None]) -> List[float]:
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - started)
+    return seconds
+
+
+def bench_filter(db, label: str, filters: Dict[str, Optional[object]], repeat: int, limit: int, deep_skip: int) -> None:
+    from app.api.troubles.router import _troubles_page
+    from app.services.list_counts import invalidate_trouble_counts
+
+    def page(skip: int = 0, cursor: Optional[str] = None, include_total: bool = False):
+        return _troubles_page(
+            db, filters.get("project_id"), filters.get("category_id"), filters.get("status"),
+            skip, limit, cursor, include_total, False
+        )
+
+    # 深いページの直前の行からカーソルを作る（offset と同じ位置を取得する）
+    cursor = page(skip=deep_skip - limit).next_cursor
+
+    def total():
+        invalidate_trouble_counts()
+        page(include_total=True)
+
+    print(summarize(f"{label} offset=0", measure(repeat, page)))
+    print(summarize(f"{label} offset={deep_skip}", measure(repeat, lambda: page(skip=deep_skip))))
+    if cursor:
+        print(summarize(f"{label} cursor@{deep_skip}", measure(repeat, lambda: page(cursor=cursor))))
+    print(summarize(f"{label} total", measure(repeat, total)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--troubles", type=int, default=1_000_000)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--deep-skip", type=int, default=500)
+    parser.add_argument("--no-seed", action="store_true", help="既存のデータベースをそのまま使う")
+    args = parser.parse_args()
+
+    configure()
+    if not args.no_seed:
+        started = time.perf_counter()
+        reset_database()
+        seed(users=100, projects=args.projects, troubles=args.troubles)
+        print(f"seeded {args.troubles} troubles in {time.perf_counter() - started:.1f}s")
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"troubles={args.troubles} projects={args.projects} limit={args.limit} repeat={args.repeat}")
+        for label, filters in (
+            ("all", {}),
+            ("project", {"project_id": 1}),
+            ("project+status", {"project_id": 1, "status": "未解決"}),
+            ("category", {"category_id": 1}),
+        ):
+            bench_filter(db, label, filters, args.repeat, args.limit, args.deep_skip)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+テスト共通設定
+
+アプリケーションの設定は import 時に読み込まれるため、app をインポートする前に
+一時ディレクトリの SQLite を使うよう環境変数を設定する
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="collabo_test_"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ["DEBUG"] = "false"
+
+
+@pytest.fixture
+def db_engine():
+    """
+    テストごとに全テーブルを作り直す
+    """
+    import app.main  # noqa: F401 全モデルを登録する
+    from app.core.database import Base, engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def client(db_engine):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    # startup イベント（定期ジョブ・受付キュー）は起動しない
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers():
+    from app.core.security import create_access_token
+
+    def make(user_id: int = 1):
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    return make
@@ -0,0 +1,30 @@
+"""
+運用向けの統計エンドポイント（/admin/*）が管理者のみに公開されることを確認する
+"""
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.api.users.models import User
+
+ADMIN_URLS = (
+    "/api/v1/admin/cache/stats",
+    "/api/v1/admin/messages/ingest/stats",
+    "/api/v1/admin/auth/token-cache/stats",
+    "/api/v1/admin/auth/login-throttle/stats",
+    "/api/v1/admin/db/pool/stats",
+)
+
+
+def test_admin_stats_require_admin_user(client, auth_headers, monkeypatch):
+    db = SessionLocal()
+    for user_id in (1, 2):
+        db.add(User(user_id=user_id, name=f"user{user_id}", password="password", last_login_at=datetime.now()))
+    db.commit()
+    db.close()
+    monkeypatch.setattr(settings, "ADMIN_USER_IDS_STR", "2")
+
+    for url in ADMIN_URLS:
+        assert client.get(url).status_code == 401
+        assert client.get(url, headers=auth_headers(1)).status_code == 403
+        assert client.get(url, headers=auth_headers(2)).status_code == 200
@@ -0,0 +1,53 @@
+"""
+プロジェクト詳細（GET /projects/{id}）で、ETagの計算に使ったお気に入り状態・お困りごと数をレスポンスに使い回すことを確認する
+"""
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.core.database import SessionLocal
+from app.api.projects.models import CoCreationProject, UserProjectFavorite
+from app.api.troubles.models import TroubleCategory, TroubleStatusSummary
+from app.api.users.models import User
+from app.services.favorites import favorite_store
+
+DETAIL_URL = "/api/v1/projects/1"
+
+
+def seed_project() -> None:
+    db = SessionLocal()
+    db.add(User(user_id=1, name="user1", password="password", last_login_at=datetime.now()))
+    db.add(TroubleCategory(category_id=1, name="技術相談"))
+    db.flush()
+    db.add(CoCreationProject(project_id=1, title="猫のプロジェクト", creator_user_id=1, created_at=datetime.now()))
+    db.flush()
+    db.add(UserProjectFavorite(user_id=1, project_id=1))
+    db.add(TroubleStatusSummary(project_id=1, category_id=1, status="未解決", trouble_count=2))
+    db.commit()
+    db.close()
+
+
+def test_detail_reuses_etag_lookups(client, db_engine, auth_headers):
+    seed_project()
+    favorite_store.invalidate(1)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", record)
+    try:
+        response = client.get(DETAIL_URL, headers=auth_headers(1))
+    finally:
+        event.remove(db_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["is_favorite"] is True
+    assert body["open_troubles"] == 2
+    assert sum("user_project_favorites" in statement for statement in statements) == 1
+    assert sum("trouble_status_summary" in statement for statement in statements) == 1
+
+    cached = client.get(DETAIL_URL, headers={**auth_headers(1), "If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304
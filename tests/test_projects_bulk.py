@@ -0,0 +1,68 @@
+"""
+プロジェクトの一括登録（POST /projects/bulk）で、NDJSONの行がチャンクの境界をまたいでも読み込めることを確認する
+"""
+import json
+from datetime import datetime
+
+from app.core.database import SessionLocal
+from app.api.projects.models import ProjectCategory
+from app.api.users.models import User
+from app.services.category_catalog import project_category_catalog
+
+BULK_URL = "/api/v1/projects/bulk"
+
+
+def add_user() -> None:
+    db = SessionLocal()
+    db.add(User(user_id=1, name="user1", password="password", last_login_at=datetime.now()))
+    db.commit()
+    db.close()
+
+
+def test_ndjson_lines_split_across_chunks(client, auth_headers):
+    add_user()
+
+    body = "".join(
+        json.dumps({"title": f"猫のプロジェクト{i}", "description": "説明", "creator_user_id": 1}, ensure_ascii=False) + "\n"
+        for i in range(1, 6)
+    ) + json.dumps({"title": "改行なしの最終行", "description": "説明", "creator_user_id": 1}, ensure_ascii=False)
+    encoded = body.encode("utf-8")
+
+    def chunks():
+        # マルチバイト文字や改行の途中で区切る
+        for start in range(0, len(encoded), 7):
+            yield encoded[start:start + 7]
+
+    response = client.post(
+        BULK_URL,
+        content=chunks(),
+        headers={**auth_headers(1), "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 6
+    assert body["failed"] == 0
+
+
+def test_category_created_on_another_worker_is_accepted(client, auth_headers):
+    add_user()
+    # カタログを読み込んだ後に、他ワーカーでカテゴリーが作成された状態を作る
+    project_category_catalog.invalidate()
+    db = SessionLocal()
+    project_category_catalog.snapshot(db)
+    db.add(ProjectCategory(category_id=1, name="カテゴリー1"))
+    db.commit()
+    db.close()
+
+    response = client.post(
+        BULK_URL,
+        json=[
+            {"title": "新しいカテゴリーのプロジェクト", "description": "説明", "category_id": 1, "creator_user_id": 1},
+            {"title": "存在しないカテゴリーのプロジェクト", "description": "説明", "category_id": 2, "creator_user_id": 1},
+        ],
+        headers=auth_headers(1)
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["status"] == "created"
+    assert results[1]["error"] == "指定されたカテゴリーが見つかりません"
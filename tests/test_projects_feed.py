@@ -0,0 +1,95 @@
+"""
+トップページ用フィード（GET /projects/）のクエリ数がプロジェクト数に比例しないことを確認する
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.core.database import SessionLocal
+from app.core.token_cache import token_cache
+from app.api.projects.models import CoCreationProject, ProjectCategory, UserProjectFavorite
+from app.api.users.models import User
+from app.services.category_catalog import project_category_catalog
+from app.services.favorites import favorite_store
+from app.services.projects import invalidate_project_feed
+
+FEED_URL = "/api/v1/projects/"
+
+
+def seed_projects(count: int) -> None:
+    """
+    作成者・カテゴリーの異なるプロジェクトを count 件作成し、半分をユーザー1のお気に入りにする
+    """
+    db = SessionLocal()
+    now = datetime.now()
+    for user_id in range(1, 4):
+        db.add(User(user_id=user_id, name=f"user{user_id}", password="password", last_login_at=now))
+    for category_id in range(1, 4):
+        db.add(ProjectCategory(category_id=category_id, name=f"カテゴリー{category_id}"))
+    db.flush()
+    for project_id in range(1, count + 1):
+        db.add(CoCreationProject(
+            project_id=project_id,
+            title=f"プロジェクト{project_id}",
+            creator_user_id=project_id % 3 + 1,
+            category_id=project_id % 3 + 1,
+            created_at=now - timedelta(minutes=project_id),
+        ))
+    db.flush()
+    for project_id in range(1, count + 1, 2):
+        db.add(UserProjectFavorite(user_id=1, project_id=project_id))
+    db.commit()
+    db.close()
+
+
+def count_feed_queries(client, engine, headers) -> int:
+    """
+    キャッシュを空にした状態でフィードを取得し、実行されたSQLの数を返す
+    """
+    invalidate_project_feed()
+    project_category_catalog.invalidate()
+    favorite_store.invalidate(1)
+    token_cache.invalidate_user(1)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(FEED_URL, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["new_projects"]
+    assert body["favorite_projects"]
+    return len(statements)
+
+
+def add_projects(first_id: int, last_id: int) -> None:
+    db = SessionLocal()
+    now = datetime.now()
+    for project_id in range(first_id, last_id + 1):
+        db.add(CoCreationProject(
+            project_id=project_id,
+            title=f"プロジェクト{project_id}",
+            creator_user_id=project_id % 3 + 1,
+            category_id=project_id % 3 + 1,
+            created_at=now + timedelta(minutes=project_id),
+        ))
+        if project_id % 2:
+            db.add(UserProjectFavorite(user_id=1, project_id=project_id))
+    db.commit()
+    db.close()
+
+
+def test_feed_query_count_does_not_grow_with_projects(client, db_engine, auth_headers):
+    seed_projects(4)
+    small = count_feed_queries(client, db_engine, auth_headers(1))
+    # カテゴリー一覧・新着・お気に入り・各トラブル件数・総数・お気に入り判定
+    assert small <= 7
+
+    add_projects(5, 60)
+    assert count_feed_queries(client, db_engine, auth_headers(1)) == small
@@ -0,0 +1,27 @@
+"""
+プロジェクト検索の転置インデックスで、1文字のクエリが一致することを確認する
+"""
+import app.main  # noqa: F401 全モデルを登録する（CoCreationProject のリレーションシップ解決用）
+from app.api.projects.models import CoCreationProject
+from app.services.search_index import ProjectSearchIndex
+
+
+def make_index(*titles: str) -> ProjectSearchIndex:
+    index = ProjectSearchIndex()
+    for project_id, title in enumerate(titles, start=1):
+        index.index_project(CoCreationProject(project_id=project_id, title=title))
+    return index
+
+
+def test_single_character_query_matches_inside_words():
+    index = make_index("猫のプロジェクト", "犬の話")
+    assert [project_id for project_id, _ in index.search("猫")] == [1]
+    # 語末の文字もバイグラムの2文字目として一致する
+    assert [project_id for project_id, _ in index.search("ト")] == [1]
+
+
+def test_single_character_query_forgets_removed_projects():
+    index = make_index("猫のプロジェクト", "猫")
+    index.remove_project(1)
+    assert [project_id for project_id, _ in index.search("猫")] == [2]
+    assert index.search("ト") == []